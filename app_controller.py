@@ -204,9 +204,11 @@ class AppController(QObject):
         # Harness end-of-playback signal.
         self._harness_controller.signals.playbackEnded.connect(self._on_end_of_playback)
 
-        # Generate and show QR on idle screen
-        control_url = qr_code.build_control_url(self._app_config)
-        qimage, qr_result = qr_code.generate_control_qr_qimage(url=control_url)
+        # Show the control QR on the idle screen. MainWindow already generated it at startup.
+        cached_qr = qr_code.get_control_qr()
+        if cached_qr is None:
+            cached_qr = qr_code.init_control_qr(self._app_config)
+        qimage, qr_result = cached_qr
         if qr_result.ok:
             self._main_window.set_idle_qr(qimage)
             self._main_window.set_idle_state_text(f"Scan to control: {qr_result.url}")
@@ -7,7 +7,7 @@ from __future__ import annotations
 # Purpose:
 # - Qt-first control integration layer.
 # - Owns the embedded Flask server (web_server.py) inside the Qt process.
-# - Polls /api/status using Flask in-process test client and emits Qt signals.
+# - Polls the server's SessionState snapshot in-process (the same payload as /api/status) and emits Qt signals.
 #
 # Test Notes:
 # - In this module, control_api is tested as a contract adapter for web_server:
@@ -19,6 +19,7 @@ from __future__ import annotations
 # Design notes:
 # - Treat web_server.py as stable. This bridge adapts to it, not the other way around.
 # - Emit only typed, normalized status (ControlStatus). No raw dicts across module boundaries.
+# - status_updated fires only when the polled status differs from the previous one.
 # - Polling interval is bounded. Minimum poll interval is enforced.
 #
 ########################
@@ -176,6 +177,10 @@ class ControlApiBridge(_QtQObject):  # type: ignore[misc]
             WebServerConfig(host=self._bind_host, port=self._bind_port, web_root_dir=self._web_root_dir, debug=self._debug)
         )
 
+        # Reading the snapshot directly skips a full WSGI request plus JSON encode/decode per
+        # poll tick on the UI thread. The /api/status test client remains the fallback.
+        self._session_state: Optional[Any] = self._flask_app.extensions.get("steppy_session_state")
+
         self._server_thread: Optional[threading.Thread] = None
 
         self._poll_timer = None
@@ -262,10 +267,13 @@ class ControlApiBridge(_QtQObject):  # type: ignore[misc]
 
     def _read_status_in_process(self) -> ControlStatus:
         try:
-            with self._test_client_lock:
-                client = self._flask_app.test_client()
-                response = client.get("/api/status")
-            json_payload = response.get_json(silent=True) or {}
+            if self._session_state is not None:
+                json_payload = self._session_state.snapshot()
+            else:
+                with self._test_client_lock:
+                    client = self._flask_app.test_client()
+                    response = client.get("/api/status")
+                json_payload = response.get_json(silent=True) or {}
             if not isinstance(json_payload, dict):
                 json_payload = {"ok": False, "state": "ERROR", "error": "Invalid status payload"}
             return ControlStatus.from_dict(json_payload)
@@ -285,6 +293,9 @@ class ControlApiBridge(_QtQObject):  # type: ignore[misc]
 
     def _maybe_emit_status(self, status: ControlStatus) -> None:
         with self._read_lock:
+            # Idle and paused polls usually repeat the last status exactly; nothing to emit.
+            if status == self._last_status:
+                return
             self._last_status = status
 
         state_value = status.state
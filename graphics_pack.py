@@ -70,6 +70,8 @@ class GraphicsPack:
 
         self._pixmap_cache: Dict[Path, QPixmap] = {}
         self._scaled_pixmap_cache: Dict[Tuple[Path, int], QPixmap] = {}
+        # Per-frame hot path: (lane_index, size_int) -> tap note pixmap, skipping direction and path lookup.
+        self._tap_note_pixmap_cache: Dict[Tuple[int, int], QPixmap] = {}
 
         self._lane_to_direction = {
             0: "Left",
@@ -224,18 +226,23 @@ class GraphicsPack:
     def _direction_for_lane(self, lane_index: int) -> str:
         return self._lane_to_direction.get(int(lane_index), "Down")
 
+    # Asset paths come from the parsed map as Path objects already, so they are used as cache
+    # keys directly rather than re-wrapped on every draw call.
+
     def _pixmap_for_path(self, file_path: Path) -> QPixmap:
-        path_key = Path(file_path)
-        cached_pixmap = self._pixmap_cache.get(path_key)
+        cached_pixmap = self._pixmap_cache.get(file_path)
         if cached_pixmap is not None:
             return cached_pixmap
-        loaded_pixmap = QPixmap(str(path_key))
-        self._pixmap_cache[path_key] = loaded_pixmap
+        loaded_pixmap = QPixmap(str(file_path))
+        self._pixmap_cache[file_path] = loaded_pixmap
         return loaded_pixmap
 
+    def _size_key(self, size_pixels: float) -> int:
+        return int(max(1, round(float(size_pixels))))
+
     def _scaled_pixmap(self, file_path: Path, size_pixels: float) -> QPixmap:
-        size_int = int(max(1, round(float(size_pixels))))
-        cache_key = (Path(file_path), size_int)
+        size_int = self._size_key(size_pixels)
+        cache_key = (file_path, size_int)
         cached_scaled = self._scaled_pixmap_cache.get(cache_key)
         if cached_scaled is not None:
             return cached_scaled
@@ -322,11 +329,15 @@ class GraphicsPack:
         center: QPointF,
         size_pixels: float,
     ) -> None:
-        direction = self._direction_for_lane(lane_index)
-        file_path = self._tap_note_paths_by_direction.get(direction) or self._tap_note_paths_by_direction.get("Down")
-        if file_path is None:
-            return
-        pixmap = self._scaled_pixmap(file_path, size_pixels)
+        resolved_key = (int(lane_index), self._size_key(size_pixels))
+        pixmap = self._tap_note_pixmap_cache.get(resolved_key)
+        if pixmap is None:
+            direction = self._direction_for_lane(lane_index)
+            file_path = self._tap_note_paths_by_direction.get(direction) or self._tap_note_paths_by_direction.get("Down")
+            if file_path is None:
+                return
+            pixmap = self._scaled_pixmap(file_path, size_pixels)
+            self._tap_note_pixmap_cache[resolved_key] = pixmap
         self._draw_centered_pixmap(painter, pixmap, center)
 
     def draw_tap_explosion(
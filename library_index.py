@@ -36,6 +36,8 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+import fnmatch
+import os
 from pathlib import Path
 from typing import Literal, List
 
@@ -58,11 +60,20 @@ def auto_chart_dir(video_id: str) -> Path:
 
 
 def _list_sm_files(directory_path: Path) -> List[Path]:
-    if not directory_path.exists():
+    # One scandir: DirEntry.is_file() answers from the directory listing itself on most
+    # platforms, instead of an exists/is_dir/is_file stat per path. fnmatch applies the same
+    # per-OS case rules as Path.glob.
+    try:
+        with os.scandir(directory_path) as directory_entries:
+            sm_file_names = [
+                entry.name
+                for entry in directory_entries
+                if fnmatch.fnmatch(entry.name, "*.sm") and entry.is_file()
+            ]
+    except OSError:
+        # Missing, not a directory, or unreadable: no candidates, as Path.glob would give.
         return []
-    if not directory_path.is_dir():
-        return []
-    return sorted([path for path in directory_path.glob("*.sm") if path.is_file()], key=lambda item: item.name)
+    return [directory_path / file_name for file_name in sorted(sm_file_names)]
 
 
 def list_simfile_candidates(video_id: str) -> List[ChartCandidate]:
@@ -190,8 +190,8 @@ class MainWindow(QMainWindow):
         app_config, _config_path = get_config()
         try:
             control_url = qr_code.build_control_url(app_config)
-            qimage, qr_result = qr_code.generate_control_qr_qimage(
-                url=control_url,
+            qimage, qr_result = qr_code.refresh_if_changed(
+                app_config,
                 fill_color=THEME_BACKGROUND,
                 background_color=THEME_OFFWHITE,
             )
@@ -313,12 +313,21 @@ class MainWindow(QMainWindow):
         target_width = int(self._idle_qr_label.width()) or IDLE_QR_BOX_SIZE_PX
         target_height = int(self._idle_qr_label.height()) or IDLE_QR_BOX_SIZE_PX
 
+        # QR modules are axis-aligned squares: at integer scale factors nearest-neighbor is exact,
+        # so only pay for smooth filtering when the scale is fractional.
+        target_side = min(target_width, target_height)
+        source_side = max(1, min(image.width(), image.height()))
+        if target_side % source_side == 0:
+            transformation_mode = Qt.TransformationMode.FastTransformation
+        else:
+            transformation_mode = Qt.TransformationMode.SmoothTransformation
+
         pixmap = QPixmap.fromImage(image)
         scaled = pixmap.scaled(
             target_width,
             target_height,
             Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation,
+            transformation_mode,
         )
         self._idle_qr_label.setPixmap(scaled)
         self._idle_qr_label.setText("")
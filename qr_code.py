@@ -14,6 +14,16 @@
 # Design notes:
 # - QR generation must be deterministic for a given URL.
 # - Prefer explicit validation and error reporting in QrResult over silent fallback.
+# - The control QR is generated once and cached. The control URL only changes when the
+#   web server host/port changes, so callers use get_control_qr() instead of regenerating.
+# - PNG and SVG artifacts are written on a single background IO thread. The QImage is returned
+#   without waiting for them unless the caller asks (wait_for_artifacts=True).
+# - The QImage and SVG bytes are cached per (url, fill_color, background_color).
+# - The QImage is a two-color Format_Mono image built straight from the QR module matrix
+#   (1 bit per pixel with a 2-entry color table) instead of a decoded 32-bit PNG.
+#   It is built at native resolution (1 px per module) and scaled to box_size once.
+# - Artifact filenames are a blake2b hash of (url, fill_color, background_color); an existing
+#   file is reused instead of rewritten.
 #
 ########################
 # Interfaces:
@@ -23,7 +33,11 @@
 # Public functions:
 # - build_control_url(app_config: AppConfig) -> str
 # - load_qimage_from_png(png_path: pathlib.Path) -> PyQt6.QtGui.QImage
-# - generate_control_qr_qimage(*, url: str, fill_color: str = ..., background_color: str = ...) -> tuple[PyQt6.QtGui.QImage, QrResult]
+# - generate_control_qr_qimage(*, url: str, fill_color: str = ..., background_color: str = ..., wait_for_artifacts: bool = False) -> tuple[PyQt6.QtGui.QImage, QrResult]
+# - wait_for_pending_artifacts(timeout_seconds: Optional[float] = None) -> None
+# - init_control_qr(app_config: AppConfig, *, fill_color: str = ..., background_color: str = ...) -> tuple[PyQt6.QtGui.QImage, QrResult]
+# - get_control_qr() -> Optional[tuple[PyQt6.QtGui.QImage, QrResult]]
+# - refresh_if_changed(app_config: AppConfig, *, fill_color: str = ..., background_color: str = ...) -> tuple[PyQt6.QtGui.QImage, QrResult]
 # - main() -> int
 #
 # Inputs:
@@ -31,18 +45,23 @@
 # - URL string.
 #
 # Outputs:
-# - QImage and a QrResult payload describing saved temp artifacts.
+# - QImage and a QrResult payload describing saved artifacts in <tempdir>/steppy_qr.
 #
 ########################
 
 from __future__ import annotations
 
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
+import hashlib
+import io
+import os
 import tempfile
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from PyQt6.QtGui import QImage
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QColor, QImage
 
 import config as config_module
 
@@ -58,6 +77,17 @@ class QrResult:
     error: Optional[str] = None
 
 
+# (host, port, fill_color, background_color) -> generated control QR.
+_ControlQrKey = Tuple[str, int, str, str]
+_CURRENT: Optional[Tuple[_ControlQrKey, QImage, QrResult]] = None
+
+_IO_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="qr-io")
+_PENDING_WRITES: List[Future] = []
+
+# (url, fill_color, background_color) -> (mono_qimage, svg_bytes)
+_QR_CACHE: Dict[Tuple[str, str, str], Tuple[QImage, bytes]] = {}
+
+
 def build_control_url(app_config: "config_module.AppConfig") -> str:
     host = str(app_config.web_server.host).strip()
     port = int(app_config.web_server.port)
@@ -74,11 +104,94 @@ def load_qimage_from_png(png_path: Path) -> QImage:
     return qimage
 
 
+def _default_output_directory() -> Path:
+    """Fixed artifacts directory shared by all calls, rather than leaking a temp dir per call."""
+    return Path(tempfile.gettempdir()) / "steppy_qr"
+
+
+def _build_mono_qimage(
+    matrix: List[List[bool]],
+    *,
+    fill_color: str,
+    background_color: str,
+) -> QImage:
+    """Pack a QR module matrix into a native-resolution (1 px per module) Format_Mono QImage.
+
+    Bit 1 is the fill color and bit 0 the background color.
+    """
+    size_px = len(matrix)
+    # QImage scanlines are 32-bit aligned.
+    bytes_per_line = ((size_px + 31) // 32) * 4
+    pad_bits = bytes_per_line * 8 - size_px
+
+    packed = bytearray()
+    for matrix_row in matrix:
+        row_bits = 0
+        for is_dark in matrix_row:
+            row_bits = (row_bits << 1) | (1 if is_dark else 0)
+        packed += (row_bits << pad_bits).to_bytes(bytes_per_line, "big")
+
+    # Copy so the image owns its pixels rather than borrowing the bytes buffer.
+    image = QImage(bytes(packed), size_px, size_px, bytes_per_line, QImage.Format.Format_Mono).copy()
+    image.setColorTable([QColor(str(background_color)).rgb(), QColor(str(fill_color)).rgb()])
+    return image
+
+
+def _content_addressed_path(
+    output_directory: Path,
+    prefix: str,
+    url: str,
+    fill_color: str,
+    background_color: str,
+    extension: str,
+) -> Path:
+    """Stable artifact path keyed by content, so identical QR inputs reuse the same file."""
+    key_text = "\n".join((url, fill_color, background_color))
+    digest = hashlib.blake2b(key_text.encode("utf-8"), digest_size=8).hexdigest()
+    return output_directory / f"{prefix}_{digest}.{extension}"
+
+
+def _write_bytes(output_path: Path, data: bytes) -> None:
+    temp_path = output_path.with_name(output_path.name + ".tmp")
+    temp_path.write_bytes(data)
+    os.replace(str(temp_path), str(output_path))
+
+
+def _save_qimage(output_path: Path, image: QImage) -> None:
+    temp_path = output_path.with_name(output_path.name + ".tmp")
+    if not image.save(str(temp_path), "PNG"):
+        raise OSError(f"Failed to save QR PNG: {output_path}")
+    os.replace(str(temp_path), str(output_path))
+
+
+def _submit_artifact_write(
+    writer: Callable[[Path, Any], None],
+    output_path: Path,
+    payload: Any,
+) -> Optional[Future]:
+    # Content-addressed: an existing file already holds exactly this payload.
+    if output_path.exists():
+        return None
+    _PENDING_WRITES[:] = [future for future in _PENDING_WRITES if not future.done()]
+    future = _IO_POOL.submit(writer, output_path, payload)
+    _PENDING_WRITES.append(future)
+    return future
+
+
+def wait_for_pending_artifacts(timeout_seconds: Optional[float] = None) -> None:
+    """Block until queued artifact writes finish. Raises the first write error, if any."""
+    pending = list(_PENDING_WRITES)
+    _PENDING_WRITES.clear()
+    for future in pending:
+        future.result(timeout=timeout_seconds)
+
+
 def generate_control_qr_qimage(
     *,
     url: str,
     fill_color: str = "#000000",
     background_color: str = "#ffffff",
+    wait_for_artifacts: bool = False,
 ) -> Tuple[QImage, QrResult]:
     url_text = str(url or "").strip()
     if not url_text:
@@ -93,44 +206,76 @@ def generate_control_qr_qimage(
         )
         return QImage(), empty_result
 
-    try:
-        import qrcode
-        import qrcode.image.svg
-    except Exception as exc:  # pragma: no cover
-        error_result = QrResult(
-            ok=False,
-            url=url_text,
-            svg_path="",
-            png_path="",
+    cache_key = (url_text, str(fill_color), str(background_color))
+    cached_qr = _QR_CACHE.get(cache_key)
+    if cached_qr is None:
+        try:
+            import qrcode
+            import qrcode.image.svg
+        except Exception as exc:  # pragma: no cover
+            error_result = QrResult(
+                ok=False,
+                url=url_text,
+                svg_path="",
+                png_path="",
+                fill_color=str(fill_color),
+                background_color=str(background_color),
+                error=f"qrcode import failed: {exc}",
+            )
+            return QImage(), error_result
+
+        qr_config = qrcode.QRCode(
+            version=None,
+            error_correction=qrcode.constants.ERROR_CORRECT_M,
+            box_size=8,
+            border=4,
+        )
+        qr_config.add_data(url_text)
+        qr_config.make(fit=True)
+
+        # Raster output, also saved as the PNG artifact. Built at 1 px per module and scaled
+        # once with nearest-neighbor; colors stay exact because there are only two pixel values.
+        native_image = _build_mono_qimage(
+            qr_config.get_matrix(),
             fill_color=str(fill_color),
             background_color=str(background_color),
-            error=f"qrcode import failed: {exc}",
         )
-        return QImage(), error_result
+        target_size_px = native_image.width() * int(qr_config.box_size)
+        mono_image = native_image.scaled(
+            target_size_px,
+            target_size_px,
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.FastTransformation,
+        )
 
-    artifacts_dir = Path(tempfile.mkdtemp(prefix="steppy_qr_"))
-    png_path = artifacts_dir / "control_qr.png"
-    svg_path = artifacts_dir / "control_qr.svg"
+        # SVG output (optional, but useful for crisp printing)
+        svg_buffer = io.BytesIO()
+        svg_factory = qrcode.image.svg.SvgImage
+        svg_image = qr_config.make_image(image_factory=svg_factory)
+        svg_image.save(svg_buffer)
 
-    qr_config = qrcode.QRCode(
-        version=None,
-        error_correction=qrcode.constants.ERROR_CORRECT_M,
-        box_size=8,
-        border=4,
-    )
-    qr_config.add_data(url_text)
-    qr_config.make(fit=True)
+        cached_qr = (mono_image, svg_buffer.getvalue())
+        _QR_CACHE[cache_key] = cached_qr
 
-    # PNG output
-    png_image = qr_config.make_image(fill_color=str(fill_color), back_color=str(background_color))
-    png_image.save(str(png_path))
+    qimage, svg_bytes = cached_qr
 
-    # SVG output (optional, but useful for crisp printing)
-    svg_factory = qrcode.image.svg.SvgImage
-    svg_image = qr_config.make_image(image_factory=svg_factory)
-    svg_image.save(str(svg_path))
+    artifacts_dir = _default_output_directory()
+    artifacts_dir.mkdir(parents=True, exist_ok=True)
+    png_path = _content_addressed_path(
+        artifacts_dir, "control_qr", url_text, str(fill_color), str(background_color), "png"
+    )
+    svg_path = _content_addressed_path(
+        artifacts_dir, "control_qr", url_text, str(fill_color), str(background_color), "svg"
+    )
 
-    qimage = load_qimage_from_png(png_path)
+    artifact_futures = [
+        _submit_artifact_write(_save_qimage, png_path, qimage),
+        _submit_artifact_write(_write_bytes, svg_path, svg_bytes),
+    ]
+    if wait_for_artifacts:
+        for future in artifact_futures:
+            if future is not None:
+                future.result()
 
     result = QrResult(
         ok=not qimage.isNull(),
@@ -139,15 +284,68 @@ def generate_control_qr_qimage(
         png_path=str(png_path),
         fill_color=str(fill_color),
         background_color=str(background_color),
-        error=None if not qimage.isNull() else "Failed to load QImage from PNG",
+        error=None if not qimage.isNull() else "Failed to build QImage from QR matrix",
+    )
+    return qimage, result
+
+
+def _control_qr_key(
+    app_config: "config_module.AppConfig",
+    fill_color: str,
+    background_color: str,
+) -> _ControlQrKey:
+    return (
+        str(app_config.web_server.host).strip(),
+        int(app_config.web_server.port),
+        str(fill_color),
+        str(background_color),
+    )
+
+
+def init_control_qr(
+    app_config: "config_module.AppConfig",
+    *,
+    fill_color: str = "#000000",
+    background_color: str = "#ffffff",
+) -> Tuple[QImage, QrResult]:
+    """Generate the control QR for app_config and store it as the current one."""
+    global _CURRENT
+    control_url = build_control_url(app_config)
+    qimage, result = generate_control_qr_qimage(
+        url=control_url,
+        fill_color=fill_color,
+        background_color=background_color,
     )
+    _CURRENT = (_control_qr_key(app_config, fill_color, background_color), qimage, result)
+    return qimage, result
+
+
+def get_control_qr() -> Optional[Tuple[QImage, QrResult]]:
+    """Return the cached control QR, or None if init_control_qr was never called."""
+    current = _CURRENT
+    if current is None:
+        return None
+    _key, qimage, result = current
     return qimage, result
 
 
+def refresh_if_changed(
+    app_config: "config_module.AppConfig",
+    *,
+    fill_color: str = "#000000",
+    background_color: str = "#ffffff",
+) -> Tuple[QImage, QrResult]:
+    """Return the cached control QR, regenerating only if host, port, or colors changed."""
+    current = _CURRENT
+    if current is not None and current[0] == _control_qr_key(app_config, fill_color, background_color):
+        return current[1], current[2]
+    return init_control_qr(app_config, fill_color=fill_color, background_color=background_color)
+
+
 def main() -> int:
     app_config, _config_path = config_module.get_config()
-    url = build_control_url(app_config)
-    _qimage, result = generate_control_qr_qimage(url=url)
+    _qimage, result = init_control_qr(app_config)
+    wait_for_pending_artifacts()
     if not result.ok:
         print(f"QR failed: {result.error}")
         return 1
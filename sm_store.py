@@ -8,7 +8,12 @@
 #
 # Design notes:
 # - No Qt usage. Pure parsing and serialization.
+# - load_chart_for_difficulty results are memoized per (path, mtime, size, difficulty), and the
+#   file text, header and #NOTES spans per (path, mtime, size), shared across difficulties.
+#   Returned charts and headers are shared between callers and must be treated as read-only.
 # - Parsing must be tolerant of minor format variance but never silently accept invalid charts.
+#   Only the selected #NOTES block is validated; other blocks only need a readable step type
+#   and difficulty.
 # - Difficulty normalization is a contract used by chart_engine.py.
 #
 ########################
@@ -58,15 +63,22 @@
 # - Writes .sm files to disk for caching and inspection.
 #
 ########################
+# Unit Tests:
+# python sm_store.py
+########################
 
 from __future__ import annotations
 
+import dataclasses
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
-import re
+import bisect
+import functools
 import inspect
+import itertools
+from operator import attrgetter, itemgetter
 
 
 # Gameplay model fallback for standalone parsing tests.
@@ -132,15 +144,6 @@ class LoadedSimfileChart:
     bpm_guess: float
 
 
-_ALLOWED_DIFFICULTIES = {
-    "beginner",
-    "easy",
-    "medium",
-    "hard",
-    "challenge",
-    "edit",
-}
-
 _DIFFICULTY_CANONICAL_LABEL = {
     "beginner": "Beginner",
     "easy": "Easy",
@@ -150,28 +153,111 @@ _DIFFICULTY_CANONICAL_LABEL = {
     "edit": "Edit",
 }
 
+_ALLOWED_DIFFICULTIES = frozenset(_DIFFICULTY_CANONICAL_LABEL)
+
+# Every valid dance-single row ("0000".."1111") -> lanes holding a tap, in lane order.
+# A row missing from this table is either the wrong width or has an unsupported symbol.
+# One hash lookup per row replaces per-character tap tests; symbols are only inspected
+# when building an error message.
+_DANCE_SINGLE_ROW_LANES: Dict[str, Tuple[int, ...]] = {
+    "".join(row_symbols): tuple(lane_index for lane_index, symbol in enumerate(row_symbols) if symbol == "1")
+    for row_symbols in itertools.product("01", repeat=4)
+}
+
+# Header tags read by _build_header_from_tags; values of any other tag are never sliced.
+_HEADER_TAG_NAMES = frozenset(
+    {
+        "TITLE",
+        "OFFSET",
+        "BPMS",
+        "STEPPY_VIDEO_ID",
+        "STEPPY_GENERATOR_VERSION",
+        "STEPPY_SEED",
+        "STEPPY_DURATION_HINT",
+    }
+)
+
+# Saved row text (with its newline) for every 4-bit lane mask; bit n set means lane n has a tap.
+_DANCE_SINGLE_ROW_BYTES_BY_MASK: Tuple[bytes, ...] = tuple(
+    bytes(0x31 if lane_mask >> lane_index & 1 else 0x30 for lane_index in range(4)) + b"\n"
+    for lane_mask in range(16)
+)
+
+# Characters allowed in a #TAG name (case-insensitive).
+_TAG_NAME_CHARS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_")
+
+# Deletes every str.isspace() character (highest is U+3000) in one C-level pass.
+_WHITESPACE_DELETE_TABLE = str.maketrans("", "", "".join(chr(code) for code in range(0x3001) if chr(code).isspace()))
+
+# Every byte of a NOTES body holding nothing but note symbols, measure separators and line breaks.
+_PLAIN_NOTES_TEXT_BYTES = b"01,\r\n"
+
+# Deletes the supported note symbols; whatever survives is unsupported.
+_NOTE_SYMBOL_DELETE_TABLE = str.maketrans("", "", "01")
+
+
+# Constructor shapes resolved once per model class: (model_class, constructor).
+_NOTE_EVENT_CTOR: Optional[Tuple[Any, Callable[[float, int], Any]]] = None
+_CHART_CTOR: Optional[Tuple[Any, Callable[[str, List[Any], float], Any]]] = None
 
 
-def _make_note_event(*, time_seconds: float, lane: int) -> Any:
+def _is_plain_time_lane_dataclass(NoteEventClass: Any) -> bool:
+    """True for a dataclass whose only fields are (time_seconds, lane) with no __post_init__."""
+    if not dataclasses.is_dataclass(NoteEventClass) or hasattr(NoteEventClass, "__post_init__"):
+        return False
+    class_fields = dataclasses.fields(NoteEventClass)
+    return [field.name for field in class_fields] == ["time_seconds", "lane"] and all(field.init for field in class_fields)
+
+
+def _make_fast_note_event_ctor(NoteEventClass: Any) -> Callable[[float, int], Any]:
+    """Build NoteEvents without the dataclass __init__ call.
+
+    object.__setattr__ is what a frozen dataclass __init__ uses internally, so the result is
+    identical (equality, hashing, repr) to NoteEventClass(time_seconds, lane).
+    """
+    new_instance = object.__new__
+    set_attribute = object.__setattr__
+
+    def construct(time_seconds: float, lane: int) -> Any:
+        note_event = new_instance(NoteEventClass)
+        set_attribute(note_event, "time_seconds", time_seconds)
+        set_attribute(note_event, "lane", lane)
+        return note_event
+
+    return construct
+
+
+def _resolve_note_event_ctor() -> Callable[[float, int], Any]:
+    """Return a (time_seconds, lane) -> NoteEvent constructor, discovering its shape once."""
+    global _NOTE_EVENT_CTOR
     NoteEventClass = getattr(gameplay_models, "NoteEvent", None)
     if NoteEventClass is None:
         raise SimfileValidationError("gameplay_models.NoteEvent is missing")
 
+    cached = _NOTE_EVENT_CTOR
+    if cached is not None and cached[0] is NoteEventClass:
+        return cached[1]
+
+    if _is_plain_time_lane_dataclass(NoteEventClass):
+        fast_constructor = _make_fast_note_event_ctor(NoteEventClass)
+        _NOTE_EVENT_CTOR = (NoteEventClass, fast_constructor)
+        return fast_constructor
+
     # Try common constructor shapes.
-    constructor_attempts = [
-        ("kwargs", {"time_seconds": float(time_seconds), "lane": int(lane)}),
-        ("kwargs", {"time": float(time_seconds), "lane": int(lane)}),
-        ("args", (float(time_seconds), int(lane))),
+    constructor_attempts: List[Callable[[float, int], Any]] = [
+        lambda time_seconds, lane: NoteEventClass(time_seconds=time_seconds, lane=lane),
+        lambda time_seconds, lane: NoteEventClass(time=time_seconds, lane=lane),
+        lambda time_seconds, lane: NoteEventClass(time_seconds, lane),
     ]
     last_error: Optional[BaseException] = None
-    for mode, payload in constructor_attempts:
+    for constructor in constructor_attempts:
         try:
-            if mode == "kwargs":
-                return NoteEventClass(**payload)  # type: ignore[arg-type]
-            return NoteEventClass(*payload)  # type: ignore[arg-type]
+            constructor(0.0, 0)
         except TypeError as exc:
             last_error = exc
             continue
+        _NOTE_EVENT_CTOR = (NoteEventClass, constructor)
+        return constructor
 
     raise SimfileValidationError(
         f"Failed to construct gameplay_models.NoteEvent(time_seconds, lane). Last error: {last_error}"
@@ -179,6 +265,7 @@ def _make_note_event(*, time_seconds: float, lane: int) -> Any:
 
 
 def _make_chart(*, difficulty: str, notes: List[Any], duration_seconds: float) -> Any:
+    global _CHART_CTOR
     ChartClass = getattr(gameplay_models, "Chart", None)
     if ChartClass is None:
         raise SimfileValidationError("gameplay_models.Chart is missing")
@@ -186,55 +273,60 @@ def _make_chart(*, difficulty: str, notes: List[Any], duration_seconds: float) -
     difficulty_text = str(difficulty)
     duration_value = float(duration_seconds)
 
+    cached = _CHART_CTOR
+    if cached is not None and cached[0] is ChartClass:
+        return cached[1](difficulty_text, notes, duration_value)
+
     # Prefer kwargs when supported, but be tolerant of older signatures.
-    constructor_attempts = [
-        {"difficulty": difficulty_text, "notes": notes, "duration_seconds": duration_value},
-        {"notes": notes, "duration_seconds": duration_value, "difficulty": difficulty_text},
-        {"notes": notes, "duration_seconds": duration_value},
-        {"difficulty": difficulty_text, "notes": notes, "duration": duration_value},
-        {"notes": notes, "duration": duration_value},
+    # Positional layouts are tried last as a fallback.
+    constructor_attempts: List[Callable[[str, List[Any], float], Any]] = [
+        lambda d, n, s: ChartClass(difficulty=d, notes=n, duration_seconds=s),
+        lambda d, n, s: ChartClass(notes=n, duration_seconds=s, difficulty=d),
+        lambda d, n, s: ChartClass(notes=n, duration_seconds=s),
+        lambda d, n, s: ChartClass(difficulty=d, notes=n, duration=s),
+        lambda d, n, s: ChartClass(notes=n, duration=s),
+        lambda d, n, s: ChartClass(d, n, s),
+        lambda d, n, s: ChartClass(n, s, d),
+        lambda d, n, s: ChartClass(n, s),
     ]
 
     last_error: Optional[BaseException] = None
-    for kwargs in constructor_attempts:
-        try:
-            return ChartClass(**kwargs)  # type: ignore[arg-type]
-        except TypeError as exc:
-            last_error = exc
-            continue
-
-    # Try a few positional layouts as a fallback.
-    positional_attempts = [
-        (difficulty_text, notes, duration_value),
-        (notes, duration_value, difficulty_text),
-        (notes, duration_value),
-    ]
-    for args in positional_attempts:
+    for constructor in constructor_attempts:
         try:
-            return ChartClass(*args)  # type: ignore[arg-type]
+            chart = constructor(difficulty_text, notes, duration_value)
         except TypeError as exc:
             last_error = exc
             continue
+        _CHART_CTOR = (ChartClass, constructor)
+        return chart
 
     raise SimfileValidationError(
         f"Failed to construct gameplay_models.Chart. Last error: {last_error}"
     )
 
 
-def _get_note_time_seconds(note_event: Any) -> float:
-    if hasattr(note_event, "time_seconds"):
-        return float(getattr(note_event, "time_seconds"))
-    if hasattr(note_event, "time"):
-        return float(getattr(note_event, "time"))
-    raise SimfileValidationError("NoteEvent is missing a time field (time_seconds or time)")
+# NoteEvent class -> name of its time field ("time_seconds" or "time").
+_NOTE_TIME_ATTR_BY_CLASS: Dict[type, str] = {}
 
 
-def _get_note_lane(note_event: Any) -> int:
-    if hasattr(note_event, "lane"):
-        return int(getattr(note_event, "lane"))
-    raise SimfileValidationError("NoteEvent is missing lane field")
+def _note_time_attr(note_event: Any) -> str:
+    note_class = type(note_event)
+    attr_name = _NOTE_TIME_ATTR_BY_CLASS.get(note_class)
+    if attr_name is not None:
+        return attr_name
+    if hasattr(note_event, "time_seconds"):
+        attr_name = "time_seconds"
+    elif hasattr(note_event, "time"):
+        attr_name = "time"
+    else:
+        raise SimfileValidationError("NoteEvent is missing a time field (time_seconds or time)")
+    _NOTE_TIME_ATTR_BY_CLASS[note_class] = attr_name
+    return attr_name
 
 
+def _get_note_time_seconds(note_event: Any) -> float:
+    return float(getattr(note_event, _note_time_attr(note_event)))
+
 
 def normalize_difficulty(difficulty: str) -> str:
     difficulty_text = str(difficulty or "").strip().lower()
@@ -254,21 +346,60 @@ def _read_text_utf8(file_path: Path) -> str:
         raise SimfileParseError(f"Failed to read simfile: {file_path}") from exc
 
 
-def _parse_sm_tags(simfile_text: str) -> Dict[str, str]:
-    """Parse simple #TAG:value; fields.
+def _parse_simfile_tags_and_notes(simfile_text: str) -> Tuple[Dict[str, str], List[Tuple[int, int]]]:
+    """Walk all #TAG:value; tokens in a single pass.
+
+    Tokens are located with str.find on '#', ':' and ';' rather than a lazy regex, which
+    would step through every character of every #NOTES body. A '#' only starts a tag at the
+    beginning of a line (after optional whitespace), so commented-out tags are ignored.
 
-    This intentionally ignores tags that do not match this pattern.
+    Returns:
+    - tags: header fields (_HEADER_TAG_NAMES only) keyed by upper-case tag name
+    - notes_spans: (start, end) offsets into simfile_text of each raw #NOTES body, without the
+      leading marker, surrounding whitespace, or trailing semicolon. Bodies are not copied here.
     """
     tags: Dict[str, str] = {}
-    for match in re.finditer(r"(?im)^\s*#([A-Z0-9_]+)\s*:\s*(.*?)\s*;\s*$", simfile_text):
-        tag_name = str(match.group(1) or "").strip().upper()
-        tag_value = str(match.group(2) or "").strip()
-        tags[tag_name] = tag_value
-    return tags
+    notes_spans: List[Tuple[int, int]] = []
+    find = simfile_text.find
+    search_start = 0
+    while True:
+        hash_index = find("#", search_start)
+        if hash_index < 0:
+            break
+        colon_index = find(":", hash_index + 1)
+        if colon_index < 0:
+            break
+        # A tag must open its line (after optional indentation), as with the old line-anchored
+        # pattern; this skips '#' inside values and '//' comments such as '//#BPMS:0=60;'.
+        line_start = simfile_text.rfind("\n", 0, hash_index) + 1
+        if line_start < hash_index and not simfile_text[line_start:hash_index].isspace():
+            search_start = hash_index + 1
+            continue
+        tag_name = simfile_text[hash_index + 1:colon_index].rstrip()
+        if not tag_name or not _TAG_NAME_CHARS.issuperset(tag_name):
+            # Not a tag name; try the next '#'.
+            search_start = hash_index + 1
+            continue
+        semicolon_index = find(";", colon_index + 1)
+        if semicolon_index < 0:
+            break
+
+        tag_name = tag_name.upper()
+        if tag_name == "NOTES":
+            body_start, body_end = colon_index + 1, semicolon_index
+            while body_start < body_end and simfile_text[body_start].isspace():
+                body_start += 1
+            while body_end > body_start and simfile_text[body_end - 1].isspace():
+                body_end -= 1
+            notes_spans.append((body_start, body_end))
+        elif tag_name in _HEADER_TAG_NAMES:
+            tags[tag_name] = simfile_text[colon_index + 1:semicolon_index].strip()
+        search_start = semicolon_index + 1
+    return tags, notes_spans
 
 
 def _parse_offset_seconds(tags: Dict[str, str]) -> float:
-    raw_text = tags.get("OFFSET", "").strip()
+    raw_text = tags.get("OFFSET", "")
     if not raw_text:
         return 0.0
     try:
@@ -278,10 +409,25 @@ def _parse_offset_seconds(tags: Dict[str, str]) -> float:
 
 
 def _parse_bpm_segments(tags: Dict[str, str]) -> List[Tuple[float, float]]:
-    raw_text = tags.get("BPMS", "").strip()
+    raw_text = tags.get("BPMS", "")
     if not raw_text:
         return [(0.0, 120.0)]
 
+    # Fast path for the common constant-BPM chart ("0.000=120.000"). Anything unusual,
+    # including invalid values, falls through to the general parser and its errors.
+    if "," not in raw_text and raw_text.count("=") == 1:
+        beat_text, bpm_text = raw_text.split("=")
+        try:
+            beat_value = float(beat_text)
+            bpm_value = float(bpm_text)
+        except ValueError:
+            pass
+        else:
+            if bpm_value > 0.0:
+                if beat_value == 0.0:
+                    return [(beat_value, bpm_value)]
+                return [(0.0, bpm_value), (beat_value, bpm_value)]
+
     segments: List[Tuple[float, float]] = []
     for item in raw_text.split(","):
         item_text = item.strip()
@@ -302,7 +448,17 @@ def _parse_bpm_segments(tags: Dict[str, str]) -> List[Tuple[float, float]]:
     if not segments:
         segments.append((0.0, 120.0))
 
-    segments.sort(key=lambda segment: segment[0])
+    # Sort by beat (stable), then keep the last BPM listed for a repeated beat. Segment counts
+    # are tiny, so a single walk beats building a dict.
+    segments.sort(key=itemgetter(0))
+    deduped_segments: List[Tuple[float, float]] = []
+    for segment in segments:
+        if deduped_segments and deduped_segments[-1][0] == segment[0]:
+            deduped_segments[-1] = segment
+        else:
+            deduped_segments.append(segment)
+    segments = deduped_segments
+
     if segments[0][0] != 0.0:
         # StepMania allows non-zero first beat, but this app expects a segment at beat 0.
         segments.insert(0, (0.0, segments[0][1]))
@@ -311,7 +467,7 @@ def _parse_bpm_segments(tags: Dict[str, str]) -> List[Tuple[float, float]]:
 
 
 def _parse_optional_float(tags: Dict[str, str], tag_name: str) -> Optional[float]:
-    raw_text = tags.get(tag_name, "").strip()
+    raw_text = tags.get(tag_name, "")
     if not raw_text:
         return None
     try:
@@ -321,7 +477,7 @@ def _parse_optional_float(tags: Dict[str, str], tag_name: str) -> Optional[float
 
 
 def _parse_optional_int(tags: Dict[str, str], tag_name: str) -> Optional[int]:
-    raw_text = tags.get(tag_name, "").strip()
+    raw_text = tags.get(tag_name, "")
     if not raw_text:
         return None
     try:
@@ -330,27 +486,48 @@ def _parse_optional_int(tags: Dict[str, str], tag_name: str) -> Optional[int]:
         return None
 
 
-def _extract_notes_blocks(simfile_text: str) -> List[str]:
-    """Extract raw #NOTES blocks without the leading marker and trailing semicolon."""
-    blocks: List[str] = []
-    pattern = re.compile(r"(?is)#NOTES\s*:\s*(.*?)\s*;", re.MULTILINE)
-    for match in pattern.finditer(simfile_text):
-        block_body = str(match.group(1) or "")
-        blocks.append(block_body)
-    return blocks
+def _peek_notes_block_metadata(simfile_text: str, body_start: int, body_end: int) -> Tuple[str, str, str, str, int]:
+    """Find the five metadata fields of a #NOTES body by scanning for colons.
 
-
-def _parse_notes_block(block_body: str) -> StepChartBlock:
-    parts = block_body.split(":", 5)
-    if len(parts) != 6:
+    Returns (step_type, description, difficulty, meter, notes_start), where notes_start is the
+    offset in simfile_text at which the notes text begins. The notes text itself is not copied.
+    """
+    fields: List[str] = []
+    field_start = body_start
+    for _ in range(5):
+        colon_index = simfile_text.find(":", field_start, body_end)
+        if colon_index < 0:
+            raise SimfileParseError("Invalid #NOTES block structure: expected 6 colon-separated fields")
+        fields.append(simfile_text[field_start:colon_index])
+        field_start = colon_index + 1
+    # radar values are fields[4], ignored but required
+    return fields[0], fields[1], fields[2], fields[3], field_start
+
+
+def _peek_block_type_and_difficulty(simfile_text: str, body_start: int, body_end: int) -> Tuple[str, str]:
+    """Return the raw (step_type, difficulty) fields of a #NOTES body without touching the rest."""
+    first_colon = simfile_text.find(":", body_start, body_end)
+    second_colon = simfile_text.find(":", first_colon + 1, body_end) if first_colon >= 0 else -1
+    third_colon = simfile_text.find(":", second_colon + 1, body_end) if second_colon >= 0 else -1
+    if third_colon < 0:
         raise SimfileParseError("Invalid #NOTES block structure: expected 6 colon-separated fields")
+    return simfile_text[body_start:first_colon], simfile_text[second_colon + 1:third_colon]
 
-    step_type_text = str(parts[0]).strip()
-    description_text = str(parts[1]).strip()
-    difficulty_text_raw = str(parts[2]).strip()
-    meter_text = str(parts[3]).strip()
-    # radar values are parts[4], ignored but required
-    notes_text = str(parts[5])
+
+def _parse_notes_block(simfile_text: str, body_start: int, body_end: int) -> Tuple[StepChartBlock, int]:
+    """Validate a #NOTES block's metadata.
+
+    Returns the block with empty notes_text, plus the offset where its notes text starts.
+    Callers slice the notes text only for the block they select.
+    """
+    step_type_raw, description_raw, difficulty_raw, meter_raw, notes_start = _peek_notes_block_metadata(
+        simfile_text, body_start, body_end
+    )
+
+    step_type_text = step_type_raw.strip()
+    description_text = description_raw.strip()
+    difficulty_text_raw = difficulty_raw.strip()
+    meter_text = meter_raw.strip()
 
     if not step_type_text:
         raise SimfileParseError("Missing step type in #NOTES block")
@@ -364,22 +541,24 @@ def _parse_notes_block(block_body: str) -> StepChartBlock:
 
     normalized_difficulty = normalize_difficulty(difficulty_text_raw)
 
-    return StepChartBlock(
+    block = StepChartBlock(
         step_type=step_type_text,
         difficulty=normalized_difficulty,
         meter=meter_value,
         description=description_text,
-        notes_text=notes_text,
+        notes_text="",
     )
+    return block, notes_start
 
 
 def _build_header_from_tags(tags: Dict[str, str]) -> SimfileHeader:
-    title_text = tags.get("TITLE", "").strip() or "Untitled"
+    # Tag values are stripped once by _parse_simfile_tags_and_notes.
+    title_text = tags.get("TITLE") or "Untitled"
     offset_seconds = _parse_offset_seconds(tags)
     bpm_segments = _parse_bpm_segments(tags)
 
-    steppy_video_id = tags.get("STEPPY_VIDEO_ID", "").strip() or None
-    steppy_generator_version = tags.get("STEPPY_GENERATOR_VERSION", "").strip() or None
+    steppy_video_id = tags.get("STEPPY_VIDEO_ID") or None
+    steppy_generator_version = tags.get("STEPPY_GENERATOR_VERSION") or None
     steppy_seed = _parse_optional_int(tags, "STEPPY_SEED")
     steppy_duration_seconds_hint = _parse_optional_float(tags, "STEPPY_DURATION_HINT")
 
@@ -401,35 +580,105 @@ def _bpm_guess_from_segments(bpm_segments: Sequence[Tuple[float, float]]) -> flo
     return first_bpm if first_bpm > 0.0 else 120.0
 
 
-def _build_beat_to_seconds_mapper(bpm_segments: Sequence[Tuple[float, float]]):
-    segments = list(bpm_segments) if bpm_segments else [(0.0, 120.0)]
-    segments.sort(key=lambda segment: segment[0])
+class _BeatToSecondsMapper:
+    """Piecewise-linear beat -> seconds mapping over sorted BPM segments.
+
+    Single lookups binary-search the segment start beats (O(log S)). map_many walks the
+    segments alongside ascending input, so a sorted batch of N beats costs O(N + S).
+    """
+
+    def __init__(self, bpm_segments: Sequence[Tuple[float, float]]) -> None:
+        segments = list(bpm_segments) if bpm_segments else [(0.0, 120.0)]
+        segments.sort(key=lambda segment: segment[0])
+
+        self._start_beats: List[float] = [float(start_beat) for start_beat, _ in segments]
+        self._seconds_per_beat: List[float] = [60.0 / float(bpm) for _, bpm in segments]
 
-    cumulative_seconds_at_start: List[float] = [0.0]
-    for index in range(1, len(segments)):
-        prev_start_beat, prev_bpm = segments[index - 1]
-        current_start_beat, _ = segments[index]
-        beat_delta = float(current_start_beat) - float(prev_start_beat)
-        seconds_per_beat = 60.0 / float(prev_bpm)
-        cumulative_seconds_at_start.append(cumulative_seconds_at_start[-1] + beat_delta * seconds_per_beat)
+        cumulative_seconds_at_start: List[float] = [0.0]
+        for index in range(1, len(segments)):
+            beat_delta = self._start_beats[index] - self._start_beats[index - 1]
+            cumulative_seconds_at_start.append(cumulative_seconds_at_start[-1] + beat_delta * self._seconds_per_beat[index - 1])
+        self._cumulative_seconds_at_start = cumulative_seconds_at_start
 
-    def beat_to_seconds(beat_value: float) -> float:
+    def __call__(self, beat_value: float) -> float:
         beat_number = float(beat_value)
+        segment_index = max(0, bisect.bisect_right(self._start_beats, beat_number) - 1)
+        return (
+            self._cumulative_seconds_at_start[segment_index]
+            + (beat_number - self._start_beats[segment_index]) * self._seconds_per_beat[segment_index]
+        )
+
+    def map_many(self, beat_values: Sequence[float]) -> List[float]:
+        start_beats = self._start_beats
+        seconds_per_beat = self._seconds_per_beat
+        cumulative_seconds_at_start = self._cumulative_seconds_at_start
+        bisect_right = bisect.bisect_right
+
+        # Single-segment charts (the common case) need no lookup at all.
+        if len(start_beats) == 1:
+            start_beat = start_beats[0]
+            segment_seconds_per_beat = seconds_per_beat[0]
+            return [(float(beat_number) - start_beat) * segment_seconds_per_beat for beat_number in beat_values]
+
+        # Parsed beats arrive in ascending order, so walk the segment index forward like a
+        # merge (O(N + S)); only a beat that steps backwards pays for a binary search.
+        last_segment_index = len(start_beats) - 1
         segment_index = 0
-        for index in range(len(segments)):
-            start_beat, _ = segments[index]
-            if beat_number >= float(start_beat):
-                segment_index = index
-            else:
-                break
-        segment_start_beat, segment_bpm = segments[segment_index]
-        seconds_per_beat = 60.0 / float(segment_bpm)
-        return cumulative_seconds_at_start[segment_index] + (beat_number - float(segment_start_beat)) * seconds_per_beat
+        next_segment_start = start_beats[1]
+        seconds: List[float] = []
+        for beat_number in beat_values:
+            if beat_number >= next_segment_start:
+                while segment_index < last_segment_index and start_beats[segment_index + 1] <= beat_number:
+                    segment_index += 1
+                next_segment_start = (
+                    start_beats[segment_index + 1] if segment_index < last_segment_index else float("inf")
+                )
+            elif segment_index and beat_number < start_beats[segment_index]:
+                segment_index = max(0, bisect_right(start_beats, beat_number) - 1)
+                next_segment_start = start_beats[segment_index + 1]
+            seconds.append(
+                cumulative_seconds_at_start[segment_index]
+                + (beat_number - start_beats[segment_index]) * seconds_per_beat[segment_index]
+            )
+        return seconds
+
 
-    return beat_to_seconds
+def _build_beat_to_seconds_mapper(bpm_segments: Sequence[Tuple[float, float]]) -> _BeatToSecondsMapper:
+    return _beat_to_seconds_mapper_for(tuple(bpm_segments))
 
 
-def _parse_notes_text_to_events(notes_text: str, *, beat_to_seconds) -> List[Any]:
+@functools.lru_cache(maxsize=64)
+def _beat_to_seconds_mapper_for(bpm_segments: Tuple[Tuple[float, float], ...]) -> _BeatToSecondsMapper:
+    # Mappers are immutable once built; every chart of a simfile (and every simfile sharing
+    # a BPM map) reuses the same sorted segments and prefix sums.
+    return _BeatToSecondsMapper(bpm_segments)
+
+
+def _invalid_dance_single_row_error(normalized_row: str, row_text: str) -> SimfileValidationError:
+    if len(normalized_row) != 4:
+        return SimfileValidationError(
+            f"Invalid row width for dance-single. Expected 4, got {len(normalized_row)}: {row_text!r}"
+        )
+    unsupported_symbols = normalized_row.translate(_NOTE_SYMBOL_DELETE_TABLE)
+    if unsupported_symbols:
+        return SimfileValidationError(
+            f"Unsupported note symbol {unsupported_symbols[0]!r} in row {row_text!r}. Supported: '0' and '1'."
+        )
+    return SimfileValidationError(f"Invalid dance-single row: {row_text!r}")
+
+
+def _dance_single_row_lanes(row_text: str) -> Tuple[int, ...]:
+    """Lanes holding a tap in one row, tolerating embedded whitespace; raises on invalid rows."""
+    row_lanes = _DANCE_SINGLE_ROW_LANES.get(row_text)
+    if row_lanes is None:
+        normalized_row = row_text.translate(_WHITESPACE_DELETE_TABLE)
+        row_lanes = _DANCE_SINGLE_ROW_LANES.get(normalized_row)
+        if row_lanes is None:
+            raise _invalid_dance_single_row_error(normalized_row, row_text)
+    return row_lanes
+
+
+def _parse_notes_text_to_events(notes_text: str, *, beat_to_seconds: _BeatToSecondsMapper) -> List[Any]:
     """Parse notes text into gameplay_models.NoteEvent list.
 
     Strict rules for this chunk:
@@ -438,103 +687,129 @@ def _parse_notes_text_to_events(notes_text: str, *, beat_to_seconds) -> List[Any
     - Supported note symbols: '0' empty, '1' tap.
     - Whitespace and // comments are allowed.
     """
-    events: List[Any] = []
-    measures: List[List[str]] = []
-    current_measure_rows: List[str] = []
-
-    def finalize_current_measure() -> None:
-        nonlocal current_measure_rows
-        measures.append(list(current_measure_rows))
-        current_measure_rows = []
-
-    for raw_line in notes_text.splitlines():
-        line_text = str(raw_line).strip()
-        if not line_text:
-            continue
-        if line_text.startswith("//"):
-            continue
-        if "//" in line_text:
-            line_text = line_text.split("//", 1)[0].strip()
-            if not line_text:
-                continue
-
-        if line_text == ",":
-            finalize_current_measure()
-            continue
-
-        if line_text.endswith(","):
-            row_part = line_text[:-1].strip()
-            if row_part:
-                current_measure_rows.append(row_part)
-            finalize_current_measure()
-            continue
-
-        current_measure_rows.append(line_text)
-
-    if current_measure_rows:
-        finalize_current_measure()
-
+    # Drop // comments first, since a comment may itself contain ','. Generated charts
+    # carry no comments, so skip the per-line pass entirely when there are none.
+    if "//" in notes_text:
+        notes_text = "\n".join([line_text.partition("//")[0] for line_text in notes_text.splitlines()])
+
+    # Measures are ','-separated; rows are the non-blank lines of each measure. Empty
+    # measures still count toward measure numbering.
+    if notes_text.isascii() and not notes_text.encode("ascii").translate(None, _PLAIN_NOTES_TEXT_BYTES):
+        # Only symbols and line breaks (generated charts): no row can contain whitespace, so a
+        # bare split() yields exactly the non-blank lines without a strip per row.
+        measures: List[List[str]] = [measure_text.split() for measure_text in notes_text.split(",")]
+    else:
+        measures = [
+            [row_text for row_text in (raw_row.strip() for raw_row in measure_text.splitlines()) if row_text]
+            for measure_text in notes_text.split(",")
+        ]
+
+    # Pass 1: locate rows holding taps as flat (beat, lanes) arrays. Jumps share one beat.
+    tap_row_beats: List[float] = []
+    tap_row_lanes: List[Tuple[int, ...]] = []
+    get_row_lanes = _DANCE_SINGLE_ROW_LANES.get
     beats_per_measure = 4.0
     for measure_index, measure_rows in enumerate(measures):
         rows_per_measure = len(measure_rows)
         if rows_per_measure <= 0:
             continue
 
-        for row_index, row_text in enumerate(measure_rows):
-            normalized_row = "".join([char for char in row_text if not char.isspace()])
-            if len(normalized_row) != 4:
-                raise SimfileValidationError(
-                    f"Invalid row width for dance-single. Expected 4, got {len(normalized_row)}: {row_text!r}"
-                )
-            for lane_index, symbol in enumerate(normalized_row):
-                if symbol == "0":
-                    continue
-                if symbol != "1":
-                    raise SimfileValidationError(
-                        f"Unsupported note symbol {symbol!r} in row {row_text!r}. Supported: '0' and '1'."
-                    )
-                beat_value = (measure_index * beats_per_measure) + (float(row_index) / float(rows_per_measure)) * beats_per_measure
-                time_seconds = float(beat_to_seconds(beat_value))
-                events.append(_make_note_event(time_seconds=float(time_seconds), lane=int(lane_index)))
-
-    events.sort(key=lambda event: (_get_note_time_seconds(event), _get_note_lane(event)))
-    return events
+        # Decode a whole measure with C-level map/compress/filter; rows are almost always
+        # already clean ASCII "0101", so only a measure with a miss takes the per-row path.
+        measure_row_lanes = list(map(get_row_lanes, measure_rows))
+        if None in measure_row_lanes:
+            measure_row_lanes = [_dance_single_row_lanes(row_text) for row_text in measure_rows]
+
+        measure_start_beat = measure_index * beats_per_measure
+        tap_row_beats += [
+            measure_start_beat + (float(row_index) / float(rows_per_measure)) * beats_per_measure
+            for row_index in itertools.compress(range(rows_per_measure), measure_row_lanes)
+        ]
+        tap_row_lanes += filter(None, measure_row_lanes)
+
+    # Pass 2: convert all row beats to seconds, then emit one event per lane in one comprehension.
+    # Measures and rows are visited in order and lanes left to right, and beat -> seconds is
+    # monotonic, so events come out already sorted by (time_seconds, lane).
+    row_times = beat_to_seconds.map_many(tap_row_beats)
+    make_note_event = _resolve_note_event_ctor()
+    return [
+        make_note_event(time_seconds, lane_index)
+        for time_seconds, row_lanes in zip(row_times, tap_row_lanes)
+        for lane_index in row_lanes
+    ]
 
 
 def _duration_from_events(events: Sequence[Any]) -> float:
+    """Chart duration from parsed events, which are already sorted by time (last is latest)."""
     if not events:
         return 0.0
-    max_time_seconds = max(_get_note_time_seconds(event) for event in events)
-    return max(0.0, max_time_seconds + 2.0)
+    return max(0.0, _get_note_time_seconds(events[-1]) + 2.0)
 
 
 def load_chart_for_difficulty(simfile_path: Path, *, difficulty: str) -> Optional[LoadedSimfileChart]:
     normalized_target_difficulty = normalize_difficulty(difficulty)
 
-    simfile_text = _read_text_utf8(simfile_path)
-    tags = _parse_sm_tags(simfile_text)
+    try:
+        simfile_stat = Path(simfile_path).stat()
+    except OSError as exc:
+        raise SimfileParseError(f"Failed to read simfile: {simfile_path}") from exc
+
+    # The mtime/size in the key invalidate the cached entry when the file is rewritten.
+    return _load_chart_cached(
+        str(simfile_path),
+        simfile_stat.st_mtime_ns,
+        simfile_stat.st_size,
+        normalized_target_difficulty,
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _load_simfile_parsed(
+    simfile_path_text: str,
+    _mtime_ns: int,
+    _size_bytes: int,
+) -> Tuple[str, SimfileHeader, Tuple[Tuple[int, int], ...]]:
+    """Read a simfile once and return (text, header, #NOTES spans) for every difficulty of it.
+
+    Keyed like _load_chart_cached, so switching difficulty on an unchanged file neither
+    rereads nor rescans it. The entry keeps the file text alive; maxsize stays small.
+    """
+    simfile_text = _read_text_utf8(Path(simfile_path_text))
+    tags, notes_spans = _parse_simfile_tags_and_notes(simfile_text)
     header = _build_header_from_tags(tags)
 
-    notes_blocks_raw = _extract_notes_blocks(simfile_text)
-    if not notes_blocks_raw:
+    if not notes_spans:
         raise SimfileParseError("No #NOTES blocks found")
 
-    parsed_blocks: List[StepChartBlock] = []
-    for block_body in notes_blocks_raw:
-        parsed_blocks.append(_parse_notes_block(block_body))
+    return simfile_text, header, tuple(notes_spans)
+
+
+@functools.lru_cache(maxsize=64)
+def _load_chart_cached(
+    simfile_path_text: str,
+    _mtime_ns: int,
+    _size_bytes: int,
+    normalized_target_difficulty: str,
+) -> Optional[LoadedSimfileChart]:
+    simfile_text, header, notes_spans = _load_simfile_parsed(simfile_path_text, _mtime_ns, _size_bytes)
+
+    # Only consider dance-single charts for this app version. If multiple blocks match, pick
+    # the first deterministically by appearance order. Other blocks are only peeked at for
+    # step type and difficulty; their metadata and notes are never parsed.
+    selected_block: Optional[StepChartBlock] = None
+    for body_start, body_end in notes_spans:
+        step_type_raw, difficulty_raw = _peek_block_type_and_difficulty(simfile_text, body_start, body_end)
+        if step_type_raw.strip().lower() != "dance-single":
+            continue
+        if difficulty_raw.strip().lower() != normalized_target_difficulty:
+            continue
+        matched_block, notes_start = _parse_notes_block(simfile_text, body_start, body_end)
+        selected_block = dataclasses.replace(matched_block, notes_text=simfile_text[notes_start:body_end])
+        break
 
-    # Only consider dance-single charts for this app version.
-    matching_blocks = [
-        block
-        for block in parsed_blocks
-        if str(block.step_type).strip().lower() == "dance-single" and block.difficulty == normalized_target_difficulty
-    ]
-    if not matching_blocks:
+    if selected_block is None:
         return None
 
-    # If multiple blocks match, pick the first deterministically by appearance order.
-    selected_block = matching_blocks[0]
-
     beat_to_seconds = _build_beat_to_seconds_mapper(header.bpm_segments)
     bpm_guess = _bpm_guess_from_segments(header.bpm_segments)
 
@@ -547,7 +822,7 @@ def load_chart_for_difficulty(simfile_path: Path, *, difficulty: str) -> Optiona
         chart=chart,
         header=header,
         step_chart=selected_block,
-        source_path=Path(simfile_path),
+        source_path=Path(simfile_path_text),
         bpm_guess=float(bpm_guess),
     )
 
@@ -562,54 +837,51 @@ def _build_notes_text_from_chart(chart: Any, *, bpm: float) -> str:
     seconds_per_beat = 60.0 / safe_bpm
     beats_per_measure = 4.0
     rows_per_measure = 16
-    beats_per_row = beats_per_measure / float(rows_per_measure)
 
     note_events = list(getattr(chart, "notes", []) or [])
-    note_events_sorted = sorted(note_events, key=lambda event: (_get_note_time_seconds(event), _get_note_lane(event)))
-
-    # Convert times to beat positions and map to (measure_index, row_index).
-    placements: List[Tuple[int, int, int]] = []
-    for note_event in note_events_sorted:
-        time_seconds = _get_note_time_seconds(note_event)
-        lane_index = _get_note_lane(note_event)
-        if lane_index < 0 or lane_index > 3:
-            raise SimfileValidationError(f"Invalid lane index for dance-single: {lane_index}")
-        beat_value = time_seconds / seconds_per_beat
-        if beat_value < 0.0:
-            continue
-        measure_index = int(beat_value // beats_per_measure)
-        beat_in_measure = beat_value - (float(measure_index) * beats_per_measure)
-        row_index = int(round(beat_in_measure / beats_per_row))
-        if row_index >= rows_per_measure:
-            measure_index += 1
-            row_index = 0
-        placements.append((measure_index, row_index, lane_index))
 
+    # Pull times and lanes out as two flat arrays once, then compute every row index in one
+    # pass. Placement order does not affect the result, so no sort is needed.
+    note_times: List[float] = []
+    note_lanes: List[int] = []
+    if note_events:
+        try:
+            note_times = [float(value) for value in map(attrgetter(_note_time_attr(note_events[0])), note_events)]
+            note_lanes = [int(value) for value in map(attrgetter("lane"), note_events)]
+        except AttributeError as exc:
+            raise SimfileValidationError(f"NoteEvent is missing a time or lane field: {exc}") from exc
+
+    # Lanes are validated up front (min/max run in C) so the placement loop only places.
+    if note_lanes and (min(note_lanes) < 0 or max(note_lanes) > 3):
+        invalid_lane = next(lane_index for lane_index in note_lanes if lane_index < 0 or lane_index > 3)
+        raise SimfileValidationError(f"Invalid lane index for dance-single: {invalid_lane}")
+
+    # Each note lands on a global 16th-note row index: round(beat * rows_per_beat). Scaling by
+    # a power of two and subtracting whole measures are exact in binary floating point, so
+    # this equals rounding within the measure, including rounding up into the next one.
+    rows_per_beat = rows_per_measure / beats_per_measure
+    global_row_indices = [round(time_seconds / seconds_per_beat * rows_per_beat) for time_seconds in note_times]
+
+    # Notes before beat 0 are dropped; the latest remaining row sizes the song up front.
     last_measure_index = 0
-    if placements:
-        last_measure_index = max(item[0] for item in placements)
-    measures_count = max(1, last_measure_index + 1)
-
-    measure_rows: List[List[List[str]]] = []
-    for _ in range(measures_count):
-        rows = []
-        for _ in range(rows_per_measure):
-            rows.append(["0", "0", "0", "0"])
-        measure_rows.append(rows)
-
-    for measure_index, row_index, lane_index in placements:
-        if measure_index < 0 or measure_index >= len(measure_rows):
+    if note_times and max(note_times) >= 0.0:
+        last_measure_index = max(global_row_indices) // rows_per_measure
+    measures_count = last_measure_index + 1
+
+    # One lane mask per row, then each mask becomes its row text through a 16-entry table.
+    row_lane_masks = bytearray(measures_count * rows_per_measure)
+    for time_seconds, global_row_index, lane_index in zip(note_times, global_row_indices, note_lanes):
+        if time_seconds < 0.0:
             continue
-        measure_rows[measure_index][row_index][lane_index] = "1"
-
-    output_lines: List[str] = []
-    for measure_index, rows in enumerate(measure_rows):
-        for row in rows:
-            output_lines.append("".join(row))
-        if measure_index != len(measure_rows) - 1:
-            output_lines.append(",")
+        row_lane_masks[global_row_index] |= 1 << lane_index
 
-    return "\n".join(output_lines) + "\n"
+    row_bytes = list(map(_DANCE_SINGLE_ROW_BYTES_BY_MASK.__getitem__, row_lane_masks))
+    return b",\n".join(
+        [
+            b"".join(row_bytes[measure_start:measure_start + rows_per_measure])
+            for measure_start in range(0, len(row_bytes), rows_per_measure)
+        ]
+    ).decode("ascii")
 
 
 def save_chart_as_sm(
@@ -630,24 +902,137 @@ def save_chart_as_sm(
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    lines: List[str] = []
-    lines.append(f"#TITLE:{str(title or 'Untitled')};")
-    lines.append(f"#OFFSET:{float(offset_seconds):.6f};")
-    lines.append(f"#BPMS:{_format_bpm_segments_for_save(float(bpm))};")
-    lines.append(f"#STEPPY_VIDEO_ID:{str(video_id)};")
-    lines.append(f"#STEPPY_GENERATOR_VERSION:{str(generator_version)};")
-    lines.append(f"#STEPPY_SEED:{int(seed)};")
-    lines.append(f"#STEPPY_DURATION_HINT:{float(duration_seconds_hint):.3f};")
-    lines.append("")
-    lines.append("#NOTES:")
-    lines.append("     dance-single:")
-    lines.append("     :")
-    lines.append(f"     {difficulty_label}:")
-    lines.append("     1:")
-    lines.append("     0.000,0.000,0.000,0.000,0.000:")
+    header_block = (
+        f"#TITLE:{str(title or 'Untitled')};\n"
+        f"#OFFSET:{float(offset_seconds):.6f};\n"
+        f"#BPMS:{_format_bpm_segments_for_save(float(bpm))};\n"
+        f"#STEPPY_VIDEO_ID:{str(video_id)};\n"
+        f"#STEPPY_GENERATOR_VERSION:{str(generator_version)};\n"
+        f"#STEPPY_SEED:{int(seed)};\n"
+        f"#STEPPY_DURATION_HINT:{float(duration_seconds_hint):.3f};\n"
+        "\n"
+        "#NOTES:\n"
+        "     dance-single:\n"
+        "     :\n"
+        f"     {difficulty_label}:\n"
+        "     1:\n"
+        "     0.000,0.000,0.000,0.000,0.000:\n"
+    )
+    # Notes text already ends with a newline after its last row.
     notes_text = _build_notes_text_from_chart(chart, bpm=float(bpm))
-    lines.append(notes_text.rstrip("\n"))
-    lines.append(";")
-    lines.append("")
 
-    output_path.write_text("\n".join(lines), encoding="utf-8")
+    with output_path.open("w", encoding="utf-8") as output_file:
+        output_file.write(header_block)
+        output_file.write(notes_text)
+        output_file.write(";\n")
+
+
+def _simfile_text_for_tests(*, header_text: str, notes_text: str, difficulty_label: str = "Easy") -> str:
+    return (
+        f"{header_text}"
+        "#NOTES:\n"
+        "     dance-single:\n"
+        "     :\n"
+        f"     {difficulty_label}:\n"
+        "     1:\n"
+        "     0.000,0.000,0.000,0.000,0.000:\n"
+        f"{notes_text}"
+        ";\n"
+    )
+
+
+def _load_note_times_for_tests(directory: Path, file_name: str, simfile_text: str) -> List[float]:
+    simfile_path = directory / file_name
+    simfile_path.write_text(simfile_text, encoding="utf-8")
+    loaded = load_chart_for_difficulty(simfile_path, difficulty="easy")
+    assert loaded is not None
+    return [_get_note_time_seconds(note_event) for note_event in loaded.chart.notes]
+
+
+def _run_unit_tests() -> None:
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as temp_dir_text:
+        temp_dir = Path(temp_dir_text)
+
+        # A commented-out tag must not override the real one.
+        note_times = _load_note_times_for_tests(
+            temp_dir,
+            "commented_tag.sm",
+            _simfile_text_for_tests(
+                header_text="#TITLE:Comment Test;\n#BPMS:0=120;\n//#BPMS:0=60;\n",
+                notes_text="1000\n0100\n0000\n0000\n",
+            ),
+        )
+        assert note_times == [0.0, 0.5], note_times
+
+        # A value ends at the first ';', even when more text follows on the same line.
+        semicolon_path = temp_dir / "semicolon_value.sm"
+        semicolon_path.write_text(
+            _simfile_text_for_tests(header_text="#TITLE:A;B;\n#BPMS:0=120;\n", notes_text="1000\n"),
+            encoding="utf-8",
+        )
+        semicolon_loaded = load_chart_for_difficulty(semicolon_path, difficulty="easy")
+        assert semicolon_loaded is not None
+        assert semicolon_loaded.header.title == "A", semicolon_loaded.header.title
+
+        # // comments are dropped from header and notes, including whole-line comments and
+        # comments that contain the ',' measure separator.
+        note_times = _load_note_times_for_tests(
+            temp_dir,
+            "comments.sm",
+            _simfile_text_for_tests(
+                header_text="// header comment\n#TITLE:Comments;\n#BPMS:0=120; // trailing comment\n",
+                notes_text="1000 // first row\n// not a row, nor a measure break\n0100\n0000\n0000\n",
+            ),
+        )
+        assert note_times == [0.0, 0.5], note_times
+
+        # Duplicate BPM beats keep the last segment given for that beat.
+        note_times = _load_note_times_for_tests(
+            temp_dir,
+            "duplicate_bpms.sm",
+            _simfile_text_for_tests(
+                header_text="#TITLE:Duplicate BPMs;\n#BPMS:0=120,0=60;\n",
+                notes_text="1000\n0100\n0000\n0000\n",
+            ),
+        )
+        assert note_times == [0.0, 1.0], note_times
+
+        # save_chart_as_sm output parses back to the same notes, jumps included.
+        saved_notes = [
+            gameplay_models.NoteEvent(time_seconds=0.0, lane=0),
+            gameplay_models.NoteEvent(time_seconds=0.125, lane=2),
+            gameplay_models.NoteEvent(time_seconds=0.5, lane=1),
+            gameplay_models.NoteEvent(time_seconds=0.5, lane=3),
+            gameplay_models.NoteEvent(time_seconds=2.25, lane=0),
+        ]
+        round_trip_path = temp_dir / "round_trip.sm"
+        save_chart_as_sm(
+            round_trip_path,
+            video_id="abc123",
+            difficulty="easy",
+            chart=gameplay_models.Chart(difficulty="easy", notes=saved_notes, duration_seconds=3.0),
+            bpm=120.0,
+            offset_seconds=0.0,
+            generator_version="test",
+            seed=7,
+            duration_seconds_hint=3.0,
+            title="Round Trip",
+        )
+        round_trip_loaded = load_chart_for_difficulty(round_trip_path, difficulty="easy")
+        assert round_trip_loaded is not None
+        assert round_trip_loaded.header.title == "Round Trip"
+        assert round_trip_loaded.header.steppy_video_id == "abc123"
+        assert round_trip_loaded.header.steppy_seed == 7
+        loaded_pairs = [
+            (round(_get_note_time_seconds(note_event), 6), int(note_event.lane))
+            for note_event in round_trip_loaded.chart.notes
+        ]
+        expected_pairs = [(note_event.time_seconds, note_event.lane) for note_event in saved_notes]
+        assert loaded_pairs == expected_pairs, loaded_pairs
+
+
+if __name__ == "__main__":
+    _run_unit_tests()
+    print("sm_store.py: ok")
@@ -34,6 +34,7 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import sys
 from pathlib import Path
 
@@ -65,6 +66,7 @@ def build_argument_parser() -> argparse.ArgumentParser:
     return parser
 
 
+@functools.lru_cache(maxsize=1)
 def _resolve_web_root_dir() -> Path:
     """
     Resolve the directory that contains web assets served by the embedded Flask server.
@@ -72,10 +74,12 @@ def _resolve_web_root_dir() -> Path:
     This is intentionally conservative:
     - If a 'web' directory exists next to this file, use it.
     - Otherwise, fall back to the project root.
+
+    The result is cached for the life of the process.
     """
     entry_file_dir = Path(__file__).resolve().parent
     candidate_dir = entry_file_dir / "web"
-    if candidate_dir.exists() and candidate_dir.is_dir():
+    if candidate_dir.is_dir():
         return candidate_dir
     return entry_file_dir
 
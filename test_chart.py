@@ -8,11 +8,12 @@
 #
 # Design notes:
 # - This is a test utility. Do not use chart_models in the runtime gameplay pipeline.
+# - TestChart is fully immutable, so build_test_chart memoizes one chart per difficulty.
 #
 ########################
 # Interfaces:
 # Public dataclasses:
-# - TestChart(difficulty: str, notes: list[chart_models.NoteEvent], duration_seconds: float)
+# - TestChart(difficulty: str, notes: tuple[chart_models.NoteEvent, ...], duration_seconds: float)
 #
 # Public functions:
 # - build_test_chart(*, difficulty: str) -> TestChart
@@ -28,7 +29,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List
+import functools
+import math
+from typing import Tuple
 
 import chart_models
 
@@ -36,26 +39,31 @@ import chart_models
 @dataclass(frozen=True)
 class TestChart:
     difficulty: str
-    notes: List[chart_models.NoteEvent]
+    notes: Tuple[chart_models.NoteEvent, ...]
     duration_seconds: float
 
 
+@functools.lru_cache(maxsize=4)
 def build_test_chart(*, difficulty: str) -> TestChart:
     difficulty_text = str(difficulty or "easy").strip().lower() or "easy"
     duration_seconds = 22.0
     step_interval = 0.5 if difficulty_text == "easy" else 0.33
     start_time = 2.0
 
-    notes: List[chart_models.NoteEvent] = []
     lane_cycle = [0, 1, 2, 3]
-    time_seconds = start_time
-    lane_index = 0
+    end_time = duration_seconds - 1.0
 
-    while time_seconds < (duration_seconds - 1.0):
-        lane = lane_cycle[lane_index % len(lane_cycle)]
-        notes.append(chart_models.NoteEvent(time_seconds=float(time_seconds), lane=int(lane), kind=chart_models.NoteKind.TAP))
-        lane_index += 1
-        time_seconds += step_interval
+    # Note i sits at start_time + i * step_interval: computed directly rather than accumulated,
+    # so late notes carry no rounding drift.
+    note_count = max(0, math.ceil((end_time - start_time) / step_interval))
+    notes = tuple(
+        chart_models.NoteEvent(
+            time_seconds=start_time + note_index * step_interval,
+            lane=lane_cycle[note_index % len(lane_cycle)],
+            kind=chart_models.NoteKind.TAP,
+        )
+        for note_index in range(note_count)
+    )
 
     return TestChart(difficulty=difficulty_text, notes=notes, duration_seconds=duration_seconds)
 
@@ -13,6 +13,19 @@ from __future__ import annotations
 # - This module is a critical dependency for gameplay_harness.py and web_server.py integrations.
 # - Strict allowlist: reject unexpected domains rather than fetching arbitrary URLs.
 # - Concurrency: safe for multi-thread usage via internal locking.
+# - Cache hits are found through an in-memory index of the cache directory, refreshed when its mtime changes.
+#   A hit still stats its file, and a name whose file is gone counts as a miss.
+# - Resolved thumbnails are memoized per URL; each memo hit stats its file, since a directory mtime
+#   with coarse resolution may not change when a file is deleted.
+# - The JSON metadata sidecar is written only when the file extension cannot express the content
+#   type; otherwise any old sidecar is removed, and the type comes from the extension and the
+#   fetch time from the file mtime.
+# - Failed downloads are remembered briefly so repeated requests for a dead URL do not refetch it.
+# - Downloads reuse pooled keep-alive connections per host; redirects are followed here and must
+#   stay on the allowlist. A redirect to any other host fails the download; urlopen used to follow
+#   it. When an environment proxy applies, urllib.request handles the fetch and its final URL is
+#   checked against the allowlist the same way. Proxy settings are read once per ThumbCache.
+# - URLs carrying user:password@ credentials are rejected rather than sent on.
 #
 ########################
 # Interfaces:
@@ -29,11 +42,18 @@ from __future__ import annotations
 #   - cache_dir() -> pathlib.Path
 #   - make_local_url(thumbnail_url: str, *, route_path: str = "/thumb") -> str
 #   - get_or_fetch(thumbnail_url: str) -> CachedThumbnail
+#   - prefetch_urls(thumbnail_urls: Iterable[str]) -> list[concurrent.futures.Future[CachedThumbnail]]
 #   - clear() -> None
 #
 ########################
+# Unit Tests:
+# python thumb_cache.py
+########################
 
+import concurrent.futures
+import functools
 import hashlib
+import http.client
 import json
 import os
 import shutil
@@ -41,9 +61,36 @@ import threading
 import time
 import urllib.parse
 import urllib.request
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Iterable, List, Optional, Tuple
+
+
+# Per-key download locks are striped over this many locks.
+_LOCK_STRIPE_COUNT = 64
+
+# Download read size; large enough that even a max-size thumbnail takes only a few reads.
+_DOWNLOAD_CHUNK_BYTES = 256 * 1024
+
+# Cached file extension by content type and back; anything unknown is treated as JPEG.
+_EXTENSION_BY_CONTENT_TYPE = {"image/png": ".png", "image/webp": ".webp", "image/gif": ".gif"}
+_CONTENT_TYPE_BY_EXTENSION = {".png": "image/png", ".webp": "image/webp", ".gif": "image/gif"}
+
+# Resolved thumbnails remembered per URL, so repeat hits skip the metadata read.
+_THUMBNAIL_MEMO_MAX_ENTRIES = 4096
+
+# Idle keep-alive connections kept per (scheme, host), and redirects followed per fetch.
+_IDLE_CONNECTIONS_PER_ORIGIN = 4
+_MAX_REDIRECTS = 5
+_REDIRECT_STATUSES = frozenset((301, 302, 303, 307, 308))
+
+# Worker threads for prefetch_urls; fetches are I/O bound.
+_PREFETCH_MAX_WORKERS = 8
+
+# Recently failed downloads are remembered per URL for this long, up to this many URLs.
+_FAILED_DOWNLOAD_TTL_SECONDS = 60.0
+_FAILED_DOWNLOAD_MAX_ENTRIES = 256
 
 
 class ThumbCacheError(Exception):
@@ -66,6 +113,11 @@ class CachedThumbnail:
     content_type: str
 
 
+def _is_success_status(status: int) -> bool:
+    # Any 2xx, as urlopen accepts, except 204: a response without a body is no thumbnail.
+    return 200 <= status < 300 and status != 204
+
+
 def _sha256_hex(value: str) -> str:
     return hashlib.sha256(value.encode("utf-8")).hexdigest()
 
@@ -78,13 +130,7 @@ def _normalize_content_type(content_type_value: str) -> str:
 
 
 def _extension_for_content_type(content_type: str) -> str:
-    if content_type == "image/png":
-        return ".png"
-    if content_type == "image/webp":
-        return ".webp"
-    if content_type == "image/gif":
-        return ".gif"
-    return ".jpg"
+    return _EXTENSION_BY_CONTENT_TYPE.get(content_type, ".jpg")
 
 
 def _safe_guess_extension_from_url(url_text: str) -> Optional[str]:
@@ -99,7 +145,36 @@ def _safe_guess_extension_from_url(url_text: str) -> Optional[str]:
     return None
 
 
-def _is_allowed_thumbnail_url(source_url: str, *, allowed_host_suffixes: Tuple[str, ...]) -> bool:
+def _parse_content_length(header_value: Optional[str]) -> Optional[int]:
+    try:
+        content_length = int(str(header_value or "").strip())
+    except ValueError:
+        return None
+    return content_length if content_length >= 0 else None
+
+
+def _metadata_content_type(metadata: Optional[dict]) -> Optional[str]:
+    value = metadata.get("content_type") if metadata is not None else None
+    if isinstance(value, str) and value.strip():
+        return value.strip()
+    return None
+
+
+def _metadata_fetched_unix_seconds(metadata: Optional[dict]) -> Optional[float]:
+    value = metadata.get("fetched_unix_seconds") if metadata is not None else None
+    if isinstance(value, (int, float)):
+        return float(value)
+    return None
+
+
+# make_local_url and the later get_or_fetch for the same URL share one parse.
+@functools.lru_cache(maxsize=1024)
+def _is_allowed_thumbnail_url(
+    source_url: str,
+    *,
+    allowed_hosts: frozenset[str],
+    allowed_dot_suffixes: Tuple[str, ...],
+) -> bool:
     try:
         parsed = urllib.parse.urlparse(source_url)
     except Exception:
@@ -113,7 +188,14 @@ def _is_allowed_thumbnail_url(source_url: str, *, allowed_host_suffixes: Tuple[s
     if not host:
         return False
 
-    return any(host == suffix or host.endswith("." + suffix) for suffix in allowed_host_suffixes)
+    return host in allowed_hosts or host.endswith(allowed_dot_suffixes)
+
+
+# Search results re-wrap the same thumbnail URLs on every page, so the encoded form is reused.
+@functools.lru_cache(maxsize=2048)
+def _local_thumbnail_url(route_path: str, source_url: str) -> str:
+    query_string = urllib.parse.urlencode({"url": source_url})
+    return f"{route_path}?{query_string}"
 
 
 class ThumbCache:
@@ -133,172 +215,510 @@ class ThumbCache:
 
         self._cache_dir = Path(cache_dir).resolve()
         self._cache_dir.mkdir(parents=True, exist_ok=True)
+        # Plain-string form for the per-request stat/scandir/open calls, which skip Path construction.
+        self._cache_dir_text = str(self._cache_dir)
 
         self._max_download_bytes = int(max(64 * 1024, max_download_bytes))
         self._request_timeout_seconds = float(max(1.0, request_timeout_seconds))
         self._allowed_host_suffixes = tuple(str(value).lower() for value in allowed_host_suffixes)
+        # Exact hosts and their ".suffix" forms, so the allowlist check is one set lookup and one endswith.
+        self._allowed_hosts = frozenset(self._allowed_host_suffixes)
+        self._allowed_dot_suffixes = tuple("." + suffix for suffix in self._allowed_host_suffixes)
+
+        # Fixed lock stripes keyed by the cache key's hex prefix: concurrent fetches of one URL
+        # serialize, memory stays bounded, and there is no guard lock or dict to grow.
+        self._lock_stripes: Tuple[threading.Lock, ...] = tuple(threading.Lock() for _ in range(_LOCK_STRIPE_COUNT))
+
+        # Names in the cache directory, rescanned when the directory mtime changes. Lets a
+        # lookup check every candidate extension with one stat instead of one per extension.
+        self._dir_index_guard = threading.Lock()
+        self._dir_index_names: Optional[set[str]] = None
+        self._dir_index_mtime_ns: int = -1
+
+        # cache_key -> (metadata file mtime_ns, parsed metadata). Reparsed only when the file changes.
+        self._metadata_cache: dict[str, tuple[int, dict]] = {}
+
+        # url -> resolved CachedThumbnail, least recently used first.
+        self._thumbnail_memo_guard = threading.Lock()
+        self._thumbnail_memo: OrderedDict[str, CachedThumbnail] = OrderedDict()
+
+        # (scheme, netloc) -> idle keep-alive connections, shared by all request threads.
+        self._idle_connections_guard = threading.Lock()
+        self._idle_connections: dict[tuple[str, str], list[http.client.HTTPConnection]] = {}
+
+        # Proxy settings, read once rather than rescanning the environment on every request and hop.
+        self._proxies = urllib.request.getproxies()
 
-        self._locks_guard = threading.Lock()
-        self._locks_by_key: dict[str, threading.Lock] = {}
+        # Created on the first prefetch_urls call and shut down by clear().
+        self._prefetch_pool_guard = threading.Lock()
+        self._prefetch_pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+        # url -> (monotonic failure time, error message), oldest first.
+        self._failed_download_guard = threading.Lock()
+        self._failed_downloads: OrderedDict[str, tuple[float, str]] = OrderedDict()
 
     def cache_dir(self) -> Path:
         return self._cache_dir
 
+    def _is_allowed_url(self, source_url: str) -> bool:
+        return _is_allowed_thumbnail_url(
+            source_url,
+            allowed_hosts=self._allowed_hosts,
+            allowed_dot_suffixes=self._allowed_dot_suffixes,
+        )
+
     def make_local_url(self, thumbnail_url: str, *, route_path: str = "/thumb") -> str:
         cleaned_url = (thumbnail_url or "").strip()
         if not cleaned_url:
             raise ThumbCacheDownloadError("Missing thumbnail url")
 
-        if not _is_allowed_thumbnail_url(cleaned_url, allowed_host_suffixes=self._allowed_host_suffixes):
+        if not self._is_allowed_url(cleaned_url):
             raise ThumbCacheUrlNotAllowedError("Thumbnail url host is not allowed")
 
-        query_string = urllib.parse.urlencode({"url": cleaned_url})
-        return f"{route_path}?{query_string}"
+        return _local_thumbnail_url(route_path, cleaned_url)
 
     def get_or_fetch(self, thumbnail_url: str) -> CachedThumbnail:
         cleaned_url = (thumbnail_url or "").strip()
         if not cleaned_url:
             raise ThumbCacheDownloadError("Missing thumbnail url")
 
-        if not _is_allowed_thumbnail_url(cleaned_url, allowed_host_suffixes=self._allowed_host_suffixes):
+        if not self._is_allowed_url(cleaned_url):
             raise ThumbCacheUrlNotAllowedError("Thumbnail url host is not allowed")
 
+        memoized_thumbnail = self._memoized_thumbnail(cleaned_url)
+        if memoized_thumbnail is not None:
+            return memoized_thumbnail
+
         cache_key = _sha256_hex(cleaned_url)
 
         with self._get_lock_for_key(cache_key):
             existing_path = self._find_existing_cached_file(cache_key)
+            existing_mtime: Optional[float] = None
             if existing_path is not None:
-                content_type = self._read_metadata_content_type(cache_key) or self._guess_content_type_from_path(existing_path)
-                fetched_unix_seconds = self._read_metadata_fetched_unix_seconds(cache_key) or existing_path.stat().st_mtime
-                return CachedThumbnail(
-                    file_path=existing_path,
+                try:
+                    existing_mtime = existing_path.stat().st_mtime
+                except OSError:
+                    # The name index can outlive a deletion when the directory mtime is coarse;
+                    # treat the stale name as a miss and download again.
+                    self._forget_cached_file_name(existing_path.name)
+            if existing_path is not None and existing_mtime is not None:
+                metadata = self._read_metadata(cache_key)
+                content_type = _metadata_content_type(metadata) or self._guess_content_type_from_path(existing_path)
+                fetched_unix_seconds = _metadata_fetched_unix_seconds(metadata) or existing_mtime
+                return self._remember_thumbnail(
+                    CachedThumbnail(
+                        file_path=existing_path,
+                        url=cleaned_url,
+                        fetched_unix_seconds=float(fetched_unix_seconds),
+                        content_type=content_type,
+                    )
+                )
+
+            failure_message = self._recent_download_failure(cleaned_url)
+            if failure_message is not None:
+                raise ThumbCacheDownloadError(failure_message)
+
+            try:
+                downloaded_path, content_type = self._download_to_cache(cache_key, cleaned_url)
+            except ThumbCacheDownloadError as exception:
+                self._remember_download_failure(cleaned_url, str(exception))
+                raise
+            fetched_unix_seconds = time.time()
+            if content_type != self._guess_content_type_from_path(downloaded_path):
+                # Only content types the file extension cannot express need a sidecar.
+                self._write_metadata(cache_key, content_type=content_type, fetched_unix_seconds=fetched_unix_seconds)
+            else:
+                # A sidecar left by an earlier fetch of another type would override the extension.
+                self._remove_metadata(cache_key)
+            return self._remember_thumbnail(
+                CachedThumbnail(
+                    file_path=downloaded_path,
                     url=cleaned_url,
                     fetched_unix_seconds=float(fetched_unix_seconds),
                     content_type=content_type,
                 )
-
-            downloaded_path, content_type = self._download_to_cache(cache_key, cleaned_url)
-            fetched_unix_seconds = time.time()
-            self._write_metadata(cache_key, content_type=content_type, fetched_unix_seconds=fetched_unix_seconds)
-            return CachedThumbnail(
-                file_path=downloaded_path,
-                url=cleaned_url,
-                fetched_unix_seconds=float(fetched_unix_seconds),
-                content_type=content_type,
             )
 
+    def prefetch_urls(self, thumbnail_urls: Iterable[str]) -> List[concurrent.futures.Future]:
+        """Fetch thumbnails in the background; each future resolves like get_or_fetch."""
+        with self._prefetch_pool_guard:
+            if self._prefetch_pool is None:
+                self._prefetch_pool = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=_PREFETCH_MAX_WORKERS,
+                    thread_name_prefix="thumb-prefetch",
+                )
+            prefetch_pool = self._prefetch_pool
+        return [prefetch_pool.submit(self.get_or_fetch, thumbnail_url) for thumbnail_url in thumbnail_urls]
+
     def clear(self) -> None:
+        with self._prefetch_pool_guard:
+            prefetch_pool = self._prefetch_pool
+            self._prefetch_pool = None
+        if prefetch_pool is not None:
+            prefetch_pool.shutdown(wait=False, cancel_futures=True)
+
         try:
             if self._cache_dir.exists():
                 shutil.rmtree(self._cache_dir, ignore_errors=True)
         finally:
             self._cache_dir.mkdir(parents=True, exist_ok=True)
+            with self._dir_index_guard:
+                self._dir_index_names = None
+            self._metadata_cache.clear()
+            with self._thumbnail_memo_guard:
+                self._thumbnail_memo.clear()
+            with self._failed_download_guard:
+                self._failed_downloads.clear()
+            self._close_idle_connections()
+
+    def _memoized_thumbnail(self, source_url: str) -> Optional[CachedThumbnail]:
+        with self._thumbnail_memo_guard:
+            thumbnail = self._thumbnail_memo.get(source_url)
+        if thumbnail is None:
+            return None
 
-    def _metadata_path(self, cache_key: str) -> Path:
-        return self._cache_dir / f"{cache_key}.json"
+        # Stat the file itself: on filesystems with coarse mtimes, deleting a file may leave the
+        # directory mtime, and so the directory index, unchanged.
+        still_cached = thumbnail.file_path.exists()
+        if not still_cached:
+            self._forget_cached_file_name(thumbnail.file_path.name)
+        with self._thumbnail_memo_guard:
+            if not still_cached:
+                self._thumbnail_memo.pop(source_url, None)
+                return None
+            if source_url in self._thumbnail_memo:
+                self._thumbnail_memo.move_to_end(source_url)
+        return thumbnail
+
+    def _remember_thumbnail(self, thumbnail: CachedThumbnail) -> CachedThumbnail:
+        with self._thumbnail_memo_guard:
+            self._thumbnail_memo[thumbnail.url] = thumbnail
+            self._thumbnail_memo.move_to_end(thumbnail.url)
+            while len(self._thumbnail_memo) > _THUMBNAIL_MEMO_MAX_ENTRIES:
+                self._thumbnail_memo.popitem(last=False)
+        return thumbnail
+
+    def _recent_download_failure(self, source_url: str) -> Optional[str]:
+        with self._failed_download_guard:
+            entry = self._failed_downloads.get(source_url)
+            if entry is None:
+                return None
+            failed_monotonic_seconds, message = entry
+            if time.monotonic() - failed_monotonic_seconds < _FAILED_DOWNLOAD_TTL_SECONDS:
+                return message
+            del self._failed_downloads[source_url]
+            return None
+
+    def _remember_download_failure(self, source_url: str, message: str) -> None:
+        with self._failed_download_guard:
+            self._failed_downloads.pop(source_url, None)
+            self._failed_downloads[source_url] = (time.monotonic(), message)
+            while len(self._failed_downloads) > _FAILED_DOWNLOAD_MAX_ENTRIES:
+                self._failed_downloads.popitem(last=False)
+
+    def _metadata_path(self, cache_key: str) -> str:
+        return os.path.join(self._cache_dir_text, f"{cache_key}.json")
 
     def _write_metadata(self, cache_key: str, *, content_type: str, fetched_unix_seconds: float) -> None:
         metadata_path = self._metadata_path(cache_key)
         payload = {"content_type": str(content_type), "fetched_unix_seconds": float(fetched_unix_seconds)}
-        metadata_path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+        with open(metadata_path, "w", encoding="utf-8") as metadata_file:
+            metadata_file.write(json.dumps(payload, indent=2, sort_keys=True))
 
-    def _read_metadata_content_type(self, cache_key: str) -> Optional[str]:
-        metadata_path = self._metadata_path(cache_key)
-        if not metadata_path.exists():
-            return None
+    def _remove_metadata(self, cache_key: str) -> None:
+        self._metadata_cache.pop(cache_key, None)
         try:
-            parsed = json.loads(metadata_path.read_text(encoding="utf-8"))
-        except Exception:
-            return None
-        value = parsed.get("content_type")
-        if isinstance(value, str) and value.strip():
-            return value.strip()
-        return None
+            os.unlink(self._metadata_path(cache_key))
+        except OSError:
+            pass
 
-    def _read_metadata_fetched_unix_seconds(self, cache_key: str) -> Optional[float]:
+    def _read_metadata(self, cache_key: str) -> Optional[dict]:
         metadata_path = self._metadata_path(cache_key)
-        if not metadata_path.exists():
+        try:
+            metadata_mtime_ns = os.stat(metadata_path).st_mtime_ns
+        except OSError:
+            self._metadata_cache.pop(cache_key, None)
             return None
+
+        cached_entry = self._metadata_cache.get(cache_key)
+        if cached_entry is not None and cached_entry[0] == metadata_mtime_ns:
+            return cached_entry[1]
+
         try:
-            parsed = json.loads(metadata_path.read_text(encoding="utf-8"))
+            # json.loads detects UTF-8 in bytes itself, so the file is read without a text decoder.
+            with open(metadata_path, "rb") as metadata_file:
+                parsed = json.loads(metadata_file.read())
         except Exception:
             return None
-        value = parsed.get("fetched_unix_seconds")
-        if isinstance(value, (int, float)):
-            return float(value)
-        return None
+        if not isinstance(parsed, dict):
+            return None
+        self._metadata_cache[cache_key] = (metadata_mtime_ns, parsed)
+        return parsed
 
     def _guess_content_type_from_path(self, file_path: Path) -> str:
-        suffix = file_path.suffix.lower()
-        if suffix == ".png":
-            return "image/png"
-        if suffix == ".webp":
-            return "image/webp"
-        if suffix == ".gif":
-            return "image/gif"
-        return "image/jpeg"
+        return _CONTENT_TYPE_BY_EXTENSION.get(file_path.suffix.lower(), "image/jpeg")
 
     def _get_lock_for_key(self, cache_key: str) -> threading.Lock:
-        with self._locks_guard:
-            lock = self._locks_by_key.get(cache_key)
-            if lock is None:
-                lock = threading.Lock()
-                self._locks_by_key[cache_key] = lock
-            return lock
+        return self._lock_stripes[int(cache_key[:8], 16) % _LOCK_STRIPE_COUNT]
+
+    def _cached_file_names(self) -> set[str]:
+        try:
+            dir_mtime_ns = os.stat(self._cache_dir_text).st_mtime_ns
+        except OSError:
+            dir_mtime_ns = -1
+
+        with self._dir_index_guard:
+            if self._dir_index_names is None or dir_mtime_ns != self._dir_index_mtime_ns:
+                try:
+                    with os.scandir(self._cache_dir_text) as directory_entries:
+                        self._dir_index_names = {entry.name for entry in directory_entries}
+                except OSError:
+                    self._dir_index_names = set()
+                self._dir_index_mtime_ns = dir_mtime_ns
+            return self._dir_index_names
+
+    def _remember_cached_file_name(self, file_name: str) -> None:
+        with self._dir_index_guard:
+            if self._dir_index_names is not None:
+                self._dir_index_names.add(file_name)
+
+    def _forget_cached_file_name(self, file_name: str) -> None:
+        with self._dir_index_guard:
+            if self._dir_index_names is not None:
+                self._dir_index_names.discard(file_name)
 
     def _find_existing_cached_file(self, cache_key: str) -> Optional[Path]:
+        cached_file_names = self._cached_file_names()
         for extension in (".jpg", ".jpeg", ".png", ".webp", ".gif"):
-            candidate = self._cache_dir / f"{cache_key}{extension}"
-            if candidate.exists():
-                return candidate
+            file_name = f"{cache_key}{extension}"
+            if file_name in cached_file_names:
+                return self._cache_dir / file_name
         return None
 
+    def _checkout_connection(self, origin: tuple[str, str]) -> http.client.HTTPConnection:
+        with self._idle_connections_guard:
+            idle_connections = self._idle_connections.get(origin)
+            if idle_connections:
+                return idle_connections.pop()
+        scheme, netloc = origin
+        connection_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return connection_class(netloc, timeout=self._request_timeout_seconds)
+
+    def _checkin_connection(self, origin: tuple[str, str], connection: http.client.HTTPConnection) -> None:
+        with self._idle_connections_guard:
+            idle_connections = self._idle_connections.setdefault(origin, [])
+            if len(idle_connections) < _IDLE_CONNECTIONS_PER_ORIGIN:
+                idle_connections.append(connection)
+                return
+        connection.close()
+
+    def _close_idle_connections(self) -> None:
+        with self._idle_connections_guard:
+            idle_connections_by_origin = self._idle_connections
+            self._idle_connections = {}
+        for idle_connections in idle_connections_by_origin.values():
+            for connection in idle_connections:
+                connection.close()
+
+    def _send_get(
+        self,
+        origin: tuple[str, str],
+        request_target: str,
+        request_headers: dict[str, str],
+    ) -> tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        connection = self._checkout_connection(origin)
+        if connection.sock is not None:
+            try:
+                connection.request("GET", request_target, headers=request_headers)
+                return connection, connection.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # The server dropped the idle keep-alive connection; retry once on a fresh one.
+                connection.close()
+        try:
+            connection.request("GET", request_target, headers=request_headers)
+            return connection, connection.getresponse()
+        except BaseException:
+            connection.close()
+            raise
+
+    def _open_response(self, source_url: str, request_headers: dict[str, str]):
+        """Return (origin, connection, response) for a 2xx response; connection is None without pooling."""
+        current_url = source_url
+        for _redirect_index in range(_MAX_REDIRECTS + 1):
+            parsed = urllib.parse.urlsplit(current_url)
+            scheme = (parsed.scheme or "").lower()
+            host = (parsed.hostname or "").lower()
+            if parsed.username is not None or parsed.password is not None:
+                # The allowlist only checks the host; credentials would reach the connection as netloc.
+                raise ThumbCacheDownloadError("Thumbnail url must not contain credentials")
+
+            if scheme in self._proxies and not urllib.request.proxy_bypass(host):
+                request_object = urllib.request.Request(current_url, headers=request_headers)
+                response = urllib.request.urlopen(request_object, timeout=self._request_timeout_seconds)
+                if not self._is_allowed_url(response.geturl()):
+                    response.close()
+                    raise ThumbCacheDownloadError("Thumbnail redirect host is not allowed")
+                if not _is_success_status(response.status):
+                    response.close()
+                    raise ThumbCacheDownloadError(
+                        f"Thumbnail download failed: HTTP Error {response.status}: {response.reason}"
+                    )
+                return None, None, response
+
+            origin = (scheme, parsed.netloc)
+            request_target = parsed.path or "/"
+            if parsed.query:
+                request_target = f"{request_target}?{parsed.query}"
+
+            connection, response = self._send_get(origin, request_target, request_headers)
+            if _is_success_status(response.status):
+                return origin, connection, response
+
+            # Redirect and error bodies are not drained; the connection is closed instead.
+            location = response.getheader("Location")
+            connection.close()
+            if response.status in _REDIRECT_STATUSES and location:
+                current_url = urllib.parse.urljoin(current_url, location)
+                # Stricter than urlopen, which followed redirects to any host.
+                if not self._is_allowed_url(current_url):
+                    raise ThumbCacheDownloadError("Thumbnail redirect host is not allowed")
+                continue
+            raise ThumbCacheDownloadError(f"Thumbnail download failed: HTTP Error {response.status}: {response.reason}")
+
+        raise ThumbCacheDownloadError("Thumbnail download failed: too many redirects")
+
     def _download_to_cache(self, cache_key: str, source_url: str) -> tuple[Path, str]:
         request_headers = {
             "User-Agent": "SteppyThumbCache/1.0",
             "Accept": "image/avif,image/webp,image/apng,image/*,*/*;q=0.8",
         }
-        request_object = urllib.request.Request(source_url, headers=request_headers)
 
-        temporary_download_path = self._cache_dir / f"{cache_key}.download.tmp"
+        temporary_download_path = os.path.join(self._cache_dir_text, f"{cache_key}.download.tmp")
         try:
-            if temporary_download_path.exists():
-                temporary_download_path.unlink()
-        except Exception:
+            os.unlink(temporary_download_path)
+        except OSError:
             pass
 
         try:
-            with urllib.request.urlopen(request_object, timeout=self._request_timeout_seconds) as response:
-                content_type = _normalize_content_type(str(response.headers.get("Content-Type") or ""))
-                if not content_type:
-                    content_type = self._guess_content_type_from_path(Path(source_url))
-
-                extension = _extension_for_content_type(content_type)
-                if extension == ".jpg":
-                    extension = _safe_guess_extension_from_url(source_url) or ".jpg"
-
-                final_path = self._cache_dir / f"{cache_key}{extension}"
-
-                total_bytes = 0
-                with open(temporary_download_path, "wb") as output_file:
-                    while True:
-                        chunk_bytes = response.read(64 * 1024)
-                        if not chunk_bytes:
-                            break
-                        total_bytes += len(chunk_bytes)
-                        if total_bytes > self._max_download_bytes:
-                            raise ThumbCacheDownloadError("Thumbnail exceeded max download size")
-                        output_file.write(chunk_bytes)
-
-            os.replace(str(temporary_download_path), str(final_path))
-            return final_path, content_type
+            origin, connection, response = self._open_response(source_url, request_headers)
+            try:
+                with response:
+                    content_type = _normalize_content_type(str(response.headers.get("Content-Type") or ""))
+                    if not content_type:
+                        content_type = self._guess_content_type_from_path(Path(source_url))
+
+                    extension = _extension_for_content_type(content_type)
+                    if extension == ".jpg":
+                        extension = _safe_guess_extension_from_url(source_url) or ".jpg"
+
+                    final_file_name = f"{cache_key}{extension}"
+
+                    content_length = _parse_content_length(response.headers.get("Content-Length"))
+                    if content_length is not None and content_length > self._max_download_bytes:
+                        raise ThumbCacheDownloadError("Thumbnail exceeded max download size")
+
+                    total_bytes = 0
+                    with open(temporary_download_path, "wb") as output_file:
+                        # Reserve the advertised size up front so the file is laid out in one extent.
+                        preallocated = False
+                        if content_length and hasattr(os, "posix_fallocate"):
+                            try:
+                                os.posix_fallocate(output_file.fileno(), 0, content_length)
+                                preallocated = True
+                            except OSError:
+                                pass
+
+                        while True:
+                            chunk_bytes = response.read(_DOWNLOAD_CHUNK_BYTES)
+                            if not chunk_bytes:
+                                break
+                            total_bytes += len(chunk_bytes)
+                            if total_bytes > self._max_download_bytes:
+                                raise ThumbCacheDownloadError("Thumbnail exceeded max download size")
+                            output_file.write(chunk_bytes)
+
+                        if preallocated and total_bytes != content_length:
+                            # The body did not match Content-Length; drop any reserved tail.
+                            output_file.truncate(total_bytes)
+            except BaseException:
+                # A partly read response leaves the connection mid-body, so it cannot be reused.
+                if connection is not None:
+                    connection.close()
+                raise
+
+            if connection is not None:
+                self._checkin_connection(origin, connection)
+
+            final_path = os.path.join(self._cache_dir_text, final_file_name)
+            os.replace(temporary_download_path, final_path)
+            self._remember_cached_file_name(final_file_name)
+            return Path(final_path), content_type
 
         except ThumbCacheDownloadError:
             raise
         except Exception as exception:
             try:
-                if temporary_download_path.exists():
-                    temporary_download_path.unlink()
-            except Exception:
+                os.unlink(temporary_download_path)
+            except OSError:
                 pass
             raise ThumbCacheDownloadError(f"Thumbnail download failed: {exception}") from exception
+
+
+def _run_unit_tests() -> None:
+    import http.server
+    import tempfile
+
+    request_count = [0]
+
+    class _JpegHandler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:
+            request_count[0] += 1
+            body_bytes = b"\xff\xd8" + b"\x00" * 64
+            self.send_response(200)
+            self.send_header("Content-Type", "image/jpeg")
+            self.send_header("Content-Length", str(len(body_bytes)))
+            self.end_headers()
+            self.wfile.write(body_bytes)
+
+        def log_message(self, *_args) -> None:
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _JpegHandler)
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir_text:
+            thumbnail_url = f"http://127.0.0.1:{server.server_address[1]}/thumb.jpg"
+            thumb_cache = ThumbCache(Path(temp_dir_text), allowed_host_suffixes=("127.0.0.1",))
+
+            # A JPEG download needs no sidecar; the extension carries the type.
+            fetched = thumb_cache.get_or_fetch(thumbnail_url)
+            assert fetched.content_type == "image/jpeg"
+            assert not any(name.endswith(".json") for name in os.listdir(temp_dir_text))
+            assert request_count[0] == 1
+
+            # Sidecar absent and file gone while the directory mtime is unchanged, as on a
+            # coarse-mtime filesystem: the stale index entry is a miss and the file is refetched.
+            thumb_cache._cached_file_names()
+            dir_stat = os.stat(temp_dir_text)
+            with thumb_cache._thumbnail_memo_guard:
+                thumb_cache._thumbnail_memo.clear()
+            os.unlink(fetched.file_path)
+            os.utime(temp_dir_text, ns=(dir_stat.st_atime_ns, dir_stat.st_mtime_ns))
+
+            refetched = thumb_cache.get_or_fetch(thumbnail_url)
+            assert refetched.file_path.exists()
+            assert refetched.content_type == "image/jpeg"
+            assert request_count[0] == 2
+
+            thumb_cache.clear()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    _run_unit_tests()
+    print("thumb_cache.py: ok")
@@ -10,6 +10,8 @@
 # - Gameplay code must use TimingModel.song_time_seconds.
 # - No Qt usage. Keep this module pure and deterministic.
 # - Clamp player time to non-negative.
+# - Song time is recomputed on each write; getters read stored floats and snapshot() reuses
+#   one frozen TimingSnapshot until the next write.
 #
 ########################
 # Interfaces:
@@ -37,6 +39,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Optional
 
 
 @dataclass(frozen=True)
@@ -50,35 +53,47 @@ class TimingModel:
     def __init__(self) -> None:
         self._player_time_seconds = 0.0
         self._av_offset_seconds = 0.0
+        # Derived on every write so the per-frame getters are plain attribute reads.
+        self._song_time_seconds = 0.0
+        # Last snapshot handed out; frozen, so it is reused until the next write.
+        self._snapshot: Optional[TimingSnapshot] = None
 
     def player_time_seconds(self) -> float:
-        return float(self._player_time_seconds)
+        return self._player_time_seconds
 
     def av_offset_seconds(self) -> float:
-        return float(self._av_offset_seconds)
+        return self._av_offset_seconds
 
     def song_time_seconds(self) -> float:
-        # Contract choice:
-        # - player time is clamped to non-negative
-        # - song time is derived from clamped player time plus AV offset
-        # - AV offset may be negative, so song time may be negative near start
-        return float(self._player_time_seconds) + float(self._av_offset_seconds)
+        return self._song_time_seconds
 
     def set_av_offset_seconds(self, av_offset_seconds: float) -> None:
         self._av_offset_seconds = float(av_offset_seconds)
+        self._update_song_time_seconds()
 
     def update_player_time_seconds(self, player_time_seconds: float) -> None:
         value = float(player_time_seconds)
         if value < 0.0:
             value = 0.0
         self._player_time_seconds = value
+        self._update_song_time_seconds()
 
     def snapshot(self) -> TimingSnapshot:
-        return TimingSnapshot(
-            player_time_seconds=self.player_time_seconds(),
-            av_offset_seconds=self.av_offset_seconds(),
-            song_time_seconds=self.song_time_seconds(),
-        )
+        if self._snapshot is None:
+            self._snapshot = TimingSnapshot(
+                player_time_seconds=self._player_time_seconds,
+                av_offset_seconds=self._av_offset_seconds,
+                song_time_seconds=self._song_time_seconds,
+            )
+        return self._snapshot
+
+    def _update_song_time_seconds(self) -> None:
+        # Contract choice:
+        # - player time is clamped to non-negative
+        # - song time is derived from clamped player time plus AV offset
+        # - AV offset may be negative, so song time may be negative near start
+        self._song_time_seconds = self._player_time_seconds + self._av_offset_seconds
+        self._snapshot = None
 
 
 def _run_unit_tests() -> None:
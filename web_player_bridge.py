@@ -11,6 +11,14 @@
 # - Emit reliable timing updates for TimingModel.
 # - Provide normalized state updates for coordinator logic.
 # - Keep JavaScript protocol details internal and provide normalized outputs.
+# - The page pushes player snapshots over QWebChannel, and only when they change. It checks every
+#   50 ms on a setInterval timer, which keeps running while the view is hidden or minimized, and
+#   re-sends an unchanged snapshot once a second as a heartbeat.
+# - The runJavaScript poll is the fallback for when pushes are not arriving, e.g. the channel is
+#   unavailable or fails later. It runs at 50 ms while playing and 250 ms in any other state.
+#   While pushes arrive, the same timer runs as a 250 ms watchdog. If no push arrives within 4
+#   push intervals while playing, or 3 heartbeats otherwise, it returns to polling until the
+#   next push.
 #
 ########################
 # Interfaces:
@@ -49,15 +57,33 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import re
+import time
 from typing import Any, Optional
 
-from PyQt6.QtCore import QObject, QTimer, pyqtSignal, QUrl
-from PyQt6.QtWebEngineCore import QWebEngineSettings
+from PyQt6.QtCore import QFile, QIODevice, QObject, QTimer, pyqtSignal, pyqtSlot, QUrl
+from PyQt6.QtWebChannel import QWebChannel
+from PyQt6.QtWebEngineCore import QWebEngineScript, QWebEngineSettings
 from PyQt6.QtWebEngineWidgets import QWebEngineView
 from PyQt6.QtWidgets import QFrame, QLabel, QStackedLayout, QVBoxLayout, QWidget
 
 
+# Fallback snapshot poll: fast while playing, slow otherwise. The idle poll keeps running so a play
+# started from the embedded player controls is still noticed.
+_PLAYING_POLL_INTERVAL_MS = 50
+_IDLE_POLL_INTERVAL_MS = 250
+_YOUTUBE_STATE_PLAYING = 1
+
+# Snapshot pushes: the page re-sends an unchanged snapshot every heartbeat, so a silent channel
+# means the push path has failed and the poll above takes over again.
+_PUSH_HEARTBEAT_MS = 1000
+_PUSH_WATCHDOG_INTERVAL_MS = _IDLE_POLL_INTERVAL_MS
+_PUSH_STALE_PLAYING_SECONDS = 4 * _PLAYING_POLL_INTERVAL_MS / 1000.0
+_PUSH_STALE_IDLE_SECONDS = 3 * _PUSH_HEARTBEAT_MS / 1000.0
+
 _YOUTUBE_ID_REGEX = re.compile(r"^[a-zA-Z0-9_-]{11}$")
+_YOUTUBE_WATCH_ID_REGEX = re.compile(r"[?&]v=([a-zA-Z0-9_-]{11})")
+_YOUTUBE_SHORT_ID_REGEX = re.compile(r"youtu\.be/([a-zA-Z0-9_-]{11})")
+_YOUTUBE_EMBED_ID_REGEX = re.compile(r"/embed/([a-zA-Z0-9_-]{11})")
 
 
 def _extract_video_id(video_id_or_url: str) -> Optional[str]:
@@ -71,13 +97,13 @@ def _extract_video_id(video_id_or_url: str) -> Optional[str]:
     # - https://www.youtube.com/watch?v=<id>
     # - https://youtu.be/<id>
     # - https://www.youtube.com/embed/<id>
-    match = re.search(r"[?&]v=([a-zA-Z0-9_-]{11})", text)
+    match = _YOUTUBE_WATCH_ID_REGEX.search(text)
     if match:
         return match.group(1)
-    match = re.search(r"youtu\.be/([a-zA-Z0-9_-]{11})", text)
+    match = _YOUTUBE_SHORT_ID_REGEX.search(text)
     if match:
         return match.group(1)
-    match = re.search(r"/embed/([a-zA-Z0-9_-]{11})", text)
+    match = _YOUTUBE_EMBED_ID_REGEX.search(text)
     if match:
         return match.group(1)
     return None
@@ -123,6 +149,16 @@ class PlayerStateInfo:
     is_ended: bool
 
 
+class _SnapshotChannelReceiver(QObject):
+    """Object the page reaches as steppyBridge over QWebChannel."""
+
+    snapshotPushed = pyqtSignal(object)
+
+    @pyqtSlot("QVariantMap")
+    def pushSnapshot(self, snapshot: Any) -> None:
+        self.snapshotPushed.emit(snapshot)
+
+
 class _WebEngineBackend(QObject):
     timeUpdated = pyqtSignal(float)
     stateChanged = pyqtSignal(object)
@@ -133,6 +169,8 @@ class _WebEngineBackend(QObject):
     def __init__(self, view: QWebEngineView) -> None:
         super().__init__()
         self._view = view
+        # The view keeps this page for its lifetime; cached so the poll and command paths skip the accessor.
+        self._page = view.page()
 
         self._html_loaded = False
         self._has_pending_video_request = False
@@ -145,14 +183,23 @@ class _WebEngineBackend(QObject):
         self._last_emitted_error_code: Optional[int] = None
 
         self._poll_timer = QTimer()
-        self._poll_timer.setInterval(50)
+        self._poll_timer.setInterval(_PLAYING_POLL_INTERVAL_MS)
         self._poll_timer.timeout.connect(self._poll_snapshot)
 
+        # Commands issued in one event-loop turn go to the page as one runJavaScript call.
         self._pending_js_calls: list[str] = []
+        self._is_js_flush_scheduled = False
+
+        self._is_push_active = False
+        self._last_push_monotonic = 0.0
+        self._snapshot_receiver = _SnapshotChannelReceiver()
+        self._snapshot_receiver.snapshotPushed.connect(self._on_pushed_snapshot)
+        self._web_channel: Optional[QWebChannel] = None
 
         self._view.loadFinished.connect(self._on_load_finished)
 
         self._configure_view_settings()
+        self._configure_web_channel()
         self._load_bootstrap_html()
 
     def backend_name(self) -> str:
@@ -185,12 +232,13 @@ class _WebEngineBackend(QObject):
         )
         self._run_js_or_queue(js)
 
-        self._poll_timer.start()
+        self._start_polling()
         self._poll_snapshot()
 
     def play(self) -> None:
         self._run_js_or_queue("window.steppyPlay();")
-        self._poll_timer.start()
+        self._set_poll_interval(is_playing=True)
+        self._start_polling()
 
     def pause(self) -> None:
         self._run_js_or_queue("window.steppyPause();")
@@ -218,6 +266,33 @@ class _WebEngineBackend(QObject):
         settings.setAttribute(QWebEngineSettings.WebAttribute.PlaybackRequiresUserGesture, False)
         settings.setAttribute(QWebEngineSettings.WebAttribute.FullScreenSupportEnabled, True)
 
+    def _configure_web_channel(self) -> None:
+        # qwebchannel.js ships as a Qt resource; inject it so the page needs no qrc:// access.
+        try:
+            script_file = QFile(":/qtwebchannel/qwebchannel.js")
+            if not script_file.open(QIODevice.OpenModeFlag.ReadOnly):
+                return
+            try:
+                script_source = bytes(script_file.readAll()).decode("utf-8")
+            finally:
+                script_file.close()
+
+            page = self._page
+            script = QWebEngineScript()
+            script.setName("steppy-qwebchannel")
+            script.setSourceCode(script_source)
+            script.setInjectionPoint(QWebEngineScript.InjectionPoint.DocumentCreation)
+            script.setWorldId(QWebEngineScript.ScriptWorldId.MainWorld)
+            script.setRunsOnSubFrames(False)
+            page.scripts().insert(script)
+
+            self._web_channel = QWebChannel(page)
+            self._web_channel.registerObject("steppyBridge", self._snapshot_receiver)
+            page.setWebChannel(self._web_channel)
+        except Exception:
+            # Without the channel the runJavaScript poll keeps working on its own.
+            self._web_channel = None
+
     def _load_bootstrap_html(self) -> None:
         # setHtml() uses base_url as the document URL.
         # Keep the origin on localhost to avoid youtube.com origin edge cases.
@@ -243,6 +318,12 @@ let steppyApiReady = false;
 let steppyReady = false;
 let steppyPendingLoad = null;
 let steppyLastErrorCode = null;
+let steppyBridge = null;
+let steppyPushEnabled = false;
+let steppyLastPushedKey = null;
+let steppyLastPushMs = 0;
+const steppyPushIntervalMs = __STEPPY_PUSH_INTERVAL_MS__;
+const steppyPushHeartbeatMs = __STEPPY_PUSH_HEARTBEAT_MS__;
 
 function _createPlayerIfNeeded(initialVideoId) {
   if (!steppyApiReady) { return; }
@@ -305,6 +386,7 @@ window.onYouTubeIframeAPIReady = function() {
 };
 
 window.steppyRequestLoadVideo = function(videoId, startSeconds, autoplay) {
+  steppyPushEnabled = true;
   steppyPendingLoad = {
     videoId: String(videoId || ''),
     startSeconds: Number(startSeconds || 0),
@@ -370,10 +452,32 @@ window.steppyGetSnapshot = function() {
     error_code: errorCode
   };
 };
+
+function _pushSnapshotIfChanged() {
+  if (!steppyBridge || !steppyPushEnabled) { return; }
+  const snapshot = window.steppyGetSnapshot();
+  const key = [snapshot.ready, snapshot.state_code, snapshot.time_seconds, snapshot.duration_seconds, snapshot.error_code].join('|');
+  const nowMs = Date.now();
+  if (key === steppyLastPushedKey && nowMs - steppyLastPushMs < steppyPushHeartbeatMs) { return; }
+  steppyLastPushedKey = key;
+  steppyLastPushMs = nowMs;
+  try { steppyBridge.pushSnapshot(snapshot); } catch (e) {}
+}
+
+if (typeof QWebChannel !== 'undefined' && typeof qt !== 'undefined' && qt.webChannelTransport) {
+  new QWebChannel(qt.webChannelTransport, function(channel) {
+    steppyBridge = channel.objects.steppyBridge || null;
+    // A timer rather than requestAnimationFrame: animation frames stop while the view is
+    // hidden, but playback and TimingModel keep going.
+    if (steppyBridge) { setInterval(_pushSnapshotIfChanged, steppyPushIntervalMs); }
+  });
+}
 </script>
 </body>
 </html>
 """
+        html = html.replace("__STEPPY_PUSH_INTERVAL_MS__", str(_PLAYING_POLL_INTERVAL_MS))
+        html = html.replace("__STEPPY_PUSH_HEARTBEAT_MS__", str(_PUSH_HEARTBEAT_MS))
         try:
             self._view.setHtml(html, base_url)
         except Exception as exc:
@@ -385,30 +489,65 @@ window.steppyGetSnapshot = function() {
             self.errorOccurred.emit("Web player failed to load")
             return
 
-        pending_calls = list(self._pending_js_calls)
-        self._pending_js_calls.clear()
-        for js in pending_calls:
-            self._view.page().runJavaScript(js)
+        self._flush_pending_js_calls()
 
-        self._poll_timer.start()
+        self._start_polling()
         self._poll_snapshot()
 
     def _run_js_or_queue(self, js: str) -> None:
-        if not self._html_loaded:
-            self._pending_js_calls.append(str(js))
+        self._pending_js_calls.append(str(js))
+        if not self._html_loaded or self._is_js_flush_scheduled:
             return
+        self._is_js_flush_scheduled = True
+        QTimer.singleShot(0, self._flush_pending_js_calls)
+
+    def _flush_pending_js_calls(self) -> None:
+        self._is_js_flush_scheduled = False
+        if not self._html_loaded or not self._pending_js_calls:
+            return
+        combined_js = "\n".join(self._pending_js_calls)
+        self._pending_js_calls.clear()
         try:
-            self._view.page().runJavaScript(str(js))
+            self._page.runJavaScript(combined_js)
         except Exception as exc:
             self.errorOccurred.emit(f"Web player JS call failed: {exc!r}")
 
+    def _start_polling(self) -> None:
+        self._poll_timer.start()
+
+    def _set_poll_interval(self, *, is_playing: bool) -> None:
+        if self._is_push_active:
+            self._poll_timer.setInterval(_PUSH_WATCHDOG_INTERVAL_MS)
+        else:
+            self._poll_timer.setInterval(_PLAYING_POLL_INTERVAL_MS if is_playing else _IDLE_POLL_INTERVAL_MS)
+
+    def _on_pushed_snapshot(self, snapshot: Any) -> None:
+        self._last_push_monotonic = time.monotonic()
+        if not self._is_push_active:
+            # Keep the timer running as a watchdog; it resumes polling if pushes stop.
+            self._is_push_active = True
+            self._set_poll_interval(is_playing=False)
+        self._on_snapshot_result(snapshot)
+
+    def _is_push_stale(self) -> bool:
+        is_playing = self._last_emitted_state_code == _YOUTUBE_STATE_PLAYING
+        stale_after_seconds = _PUSH_STALE_PLAYING_SECONDS if is_playing else _PUSH_STALE_IDLE_SECONDS
+        return time.monotonic() - self._last_push_monotonic > stale_after_seconds
+
     def _poll_snapshot(self) -> None:
+        if self._is_push_active:
+            if not self._is_push_stale():
+                return
+            self._is_push_active = False
+            self._set_poll_interval(is_playing=self._last_emitted_state_code == _YOUTUBE_STATE_PLAYING)
         if not self._html_loaded:
             return
         if not self._has_pending_video_request:
             return
+        # Send queued commands first so the snapshot reflects them.
+        self._flush_pending_js_calls()
         try:
-            self._view.page().runJavaScript("window.steppyGetSnapshot();", self._on_snapshot_result)
+            self._page.runJavaScript("window.steppyGetSnapshot();", self._on_snapshot_result)
         except Exception as exc:
             self.errorOccurred.emit(f"Web player snapshot poll failed: {exc!r}")
 
@@ -462,6 +601,9 @@ window.steppyGetSnapshot = function() {
                 duration_changed = True
                 self._duration_seconds = float(duration_seconds_value)
 
+        if state_changed:
+            self._set_poll_interval(is_playing=int(state_code_value) == _YOUTUBE_STATE_PLAYING)
+
         if state_changed or duration_changed:
             self._last_emitted_state_code = int(state_code_value)
             state_name = _state_name_for_youtube_state_code(state_code_value)